@@ -1,33 +1,378 @@
 # app.py - UPDATED WITH NEWS SECTION AND ROUTES
-from flask import Flask, render_template, jsonify, request, redirect, url_for, send_from_directory, abort
+import time
+STARTUP_BEGAN = time.perf_counter()
+
+from flask import Flask, render_template, jsonify, request, redirect, url_for, send_from_directory, abort, Response, session, g, has_request_context
 from flask_cors import CORS
-import requests
-from datetime import datetime, timedelta
+from jinja2 import FileSystemBytecodeCache
+import click
+from datetime import datetime, timedelta, timezone
 import hashlib
+import hmac
+import importlib
 import os
 from dotenv import load_dotenv
-import pytz
 import logging
-import time
+from logging.handlers import QueueHandler, QueueListener
 import os
+import sys
+import json
+import re
+import queue
+import threading
+import pickle
+import zlib
+import atexit
+import signal
+import sqlite3
+import csv
+import math
+import random
+from dataclasses import dataclass
+from functools import lru_cache, wraps
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from collections import deque
+from typing import NamedTuple
 
-# Disable SSL warnings
-import urllib3
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
-
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
+try:
+    import orjson
+except ImportError:  # optional faster encoder
+    orjson = None
 
 # Load environment variables
 load_dotenv()
 
+# =========== LOGGING ===========
+# Records are queued on the calling thread and written by a listener thread,
+# so a burst of errors during an upstream outage never blocks a request on
+# stderr. LOG_FORMAT=text restores the plain "LEVEL:name:message" lines.
+LOG_FORMAT = os.getenv('LOG_FORMAT', 'json').lower()
+LOG_REPEAT_WINDOW = float(os.getenv('LOG_REPEAT_WINDOW', 60))
+LOG_INFO_SAMPLE_RATE = float(os.getenv('LOG_INFO_SAMPLE_RATE', 1.0))
+
+# Context passed with extra={...} that the JSON formatter emits as fields
+LOG_FIELDS = ('route', 'method', 'cache_key', 'upstream', 'latency_ms', 'attempt', 'status', 'repeated', 'sampled')
+
+class JsonLogFormatter(logging.Formatter):
+    """One JSON object per line"""
+    
+    def format(self, record):
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage(),
+        }
+        for field in LOG_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                entry[field] = value
+        if record.exc_text:
+            entry['exc'] = record.exc_text
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+class RepeatFilter(logging.Filter):
+    """
+    Let the first of identical warnings/errors through per window and count
+    the rest; the next one after the window carries `repeated` with the
+    number that were dropped.
+    """
+    
+    def __init__(self, window, max_keys=2000):
+        super().__init__()
+        self.window = window
+        self.max_keys = max_keys
+        self.seen = {}
+        self.lock = threading.Lock()
+        self.suppressed = 0
+    
+    def filter(self, record):
+        if record.levelno < logging.WARNING or self.window <= 0:
+            return True
+        key = (record.levelno, record.msg)
+        now = record.created
+        with self.lock:
+            entry = self.seen.get(key)
+            if entry is not None and now - entry[0] < self.window:
+                entry[1] += 1
+                self.suppressed += 1
+                return False
+            if entry is not None and entry[1]:
+                record.repeated = entry[1]
+            if len(self.seen) >= self.max_keys:
+                self.seen = {k: v for k, v in self.seen.items() if now - v[0] < self.window}
+                if len(self.seen) >= self.max_keys // 2:
+                    # Mostly distinct messages: tracking them buys nothing
+                    self.seen.clear()
+            self.seen[key] = [now, 0]
+        return True
+
+class SampleFilter(logging.Filter):
+    """Keep only a fraction of INFO and DEBUG records; extra={'sample_rate': 1} opts out"""
+    
+    def __init__(self, rate):
+        super().__init__()
+        self.rate = rate
+        self.dropped = 0
+    
+    def filter(self, record):
+        if record.levelno > logging.INFO:
+            return True
+        rate = getattr(record, 'sample_rate', self.rate)
+        if rate >= 1:
+            return True
+        if random.random() < rate:
+            record.sampled = rate
+            return True
+        self.dropped += 1
+        return False
+
+try:
+    # Under the gevent worker threading is monkey patched; these stay real OS primitives
+    from gevent.monkey import get_original
+    start_os_thread = get_original('_thread', 'start_new_thread')
+    os_sleep = get_original('time', 'sleep')
+except ImportError:
+    from _thread import start_new_thread as start_os_thread
+    os_sleep = time.sleep
+
+class LogBuffer:
+    """Bounded queue shared between request greenlets and the OS listener thread
+    
+    deque append/popleft are atomic, so no (possibly monkey patched) lock is
+    shared across the two sides; the reader polls instead of blocking.
+    """
+    
+    def __init__(self, maxsize, poll_interval=0.05):
+        self.items = deque()
+        self.maxsize = maxsize
+        self.poll_interval = poll_interval
+    
+    def qsize(self):
+        return len(self.items)
+    
+    def put_nowait(self, item):
+        if len(self.items) >= self.maxsize:
+            raise queue.Full
+        self.items.append(item)
+    
+    def get(self, block=True):
+        while True:
+            try:
+                return self.items.popleft()
+            except IndexError:
+                if not block:
+                    raise queue.Empty
+                os_sleep(self.poll_interval)
+
+class AsyncLogHandler(QueueHandler):
+    """QueueHandler that adds request context and never blocks or raises when full"""
+    
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+    
+    def prepare(self, record):
+        if has_request_context():
+            record.route = request.path
+            record.method = request.method
+        # Keep the traceback in exc_text rather than folding it into msg, so the
+        # JSON formatter can emit it as its own field
+        record = logging.makeLogRecord(record.__dict__)
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.msg = record.getMessage()
+        record.args = None
+        record.exc_info = None
+        return record
+    
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+class OsThreadQueueListener(QueueListener):
+    """QueueListener that writes from a real OS thread even under gevent
+    
+    A patched threading.Thread would be a greenlet, so a blocking stderr write
+    would stall every request on the worker.
+    """
+    
+    def start(self):
+        self.finished = False
+        self._thread = True
+        start_os_thread(self.run, ())
+    
+    def run(self):
+        try:
+            self._monitor()
+        finally:
+            self.finished = True
+    
+    def stop(self, timeout=5):
+        if not self._thread:
+            return
+        self.enqueue_sentinel()
+        deadline = time.monotonic() + timeout
+        while not self.finished and time.monotonic() < deadline:
+            os_sleep(0.01)
+        self._thread = None
+
+def configure_logging():
+    stream_handler = logging.StreamHandler(sys.stderr)
+    stream_handler.setFormatter(
+        JsonLogFormatter() if LOG_FORMAT == 'json' else logging.Formatter(logging.BASIC_FORMAT))
+    
+    handler = AsyncLogHandler(LogBuffer(int(os.getenv('LOG_QUEUE_SIZE', 10000))))
+    handler.addFilter(SampleFilter(LOG_INFO_SAMPLE_RATE))
+    handler.addFilter(RepeatFilter(LOG_REPEAT_WINDOW))
+    
+    root = logging.getLogger()
+    for existing in root.handlers[:]:
+        root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(os.getenv('LOG_LEVEL', 'INFO').upper())
+    
+    listener = OsThreadQueueListener(handler.queue, stream_handler, respect_handler_level=False)
+    listener.start()
+    # Drain whatever is still queued on a normal exit
+    atexit.register(listener.stop)
+    return handler, listener
+
+log_handler, log_listener = configure_logging()
+logger = logging.getLogger(__name__)
+
+def logging_report():
+    sample_filter, repeat_filter = log_handler.filters
+    return {
+        'format': LOG_FORMAT,
+        'queued': log_handler.queue.qsize(),
+        'dropped_queue_full': log_handler.dropped,
+        'suppressed_repeats': repeat_filter.suppressed,
+        'sampled_out': sample_filter.dropped,
+    }
+
+# =========== STARTUP ===========
+# LAZY_STARTUP=1 keeps the first request after a cold start (e.g. a Render
+# dyno waking up) short: heavy modules are imported on first use and the
+# refresh loops start once the first response has gone out
+LAZY_STARTUP = os.getenv('LAZY_STARTUP', '1') == '1'
+LAZY_STARTUP_DELAY = float(os.getenv('LAZY_STARTUP_DELAY', 10))
+
+def process_age():
+    """Seconds since this process started, from /proc (None where unavailable)"""
+    try:
+        with open('/proc/self/stat') as f:
+            started_ticks = int(f.read().rsplit(')', 1)[1].split()[19])
+        with open('/proc/uptime') as f:
+            uptime = float(f.read().split()[0])
+        return uptime - started_ticks / os.sysconf('SC_CLK_TCK')
+    except (OSError, ValueError, IndexError):
+        return None
+
+class StartupTimer:
+    """Per-phase boot timings and the time until the first response was ready"""
+    
+    def __init__(self, began):
+        self.began = began
+        self.last = began
+        age = process_age()
+        # Interpreter start-up happens before this module runs
+        self.phases = {'interpreter': round(max(age - (time.perf_counter() - began), 0) * 1000, 1)} if age else {}
+        self.first_request = None
+        self.deferred_done = False
+        self.deferred_ms = None
+        self.lock = threading.Lock()
+    
+    def mark(self, phase):
+        """Record the time since the previous mark under `phase`"""
+        now = time.perf_counter()
+        self.phases[phase] = round((now - self.last) * 1000, 1)
+        self.last = now
+    
+    def boot_ms(self):
+        return round(sum(self.phases.values()), 1)
+    
+    def record_first_request(self, path, started):
+        """Returns True for the first response this process produced"""
+        with self.lock:
+            if self.first_request is not None:
+                return False
+            now = time.perf_counter()
+            self.first_request = {
+                'path': path,
+                'response_ms': round((now - started) * 1000, 1) if started else None,
+                # Process start to first response ready: the wake-up TTFB
+                'ttfb_ms': round(self.phases.get('interpreter', 0) + (now - self.began) * 1000, 1),
+            }
+        logger.info(f"First response ({path}) ready {self.first_request['ttfb_ms']}ms after process start")
+        return True
+    
+    def report(self):
+        return {
+            'lazy': LAZY_STARTUP,
+            'phases_ms': dict(self.phases),
+            'boot_ms': self.boot_ms(),
+            'first_request': self.first_request,
+            'deferred_ms': self.deferred_ms,
+        }
+
+startup = StartupTimer(STARTUP_BEGAN)
+
+class LazyModule:
+    """Stand-in for a module that is imported on first attribute access"""
+    
+    def __init__(self, name, on_import=None):
+        self._name = name
+        self._on_import = on_import
+        self._module = None
+    
+    def load(self):
+        if self._module is None:
+            module = importlib.import_module(self._name)
+            if self._on_import:
+                self._on_import(module)
+            self._module = module
+        return self._module
+    
+    def __getattr__(self, attr):
+        return getattr(self._module or self.load(), attr)
+
+def _configure_requests(module):
+    # Disable SSL warnings
+    import urllib3
+    urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+# requests (with urllib3) is the heaviest import and pages never need it
+requests = LazyModule('requests', _configure_requests)
+if not LAZY_STARTUP:
+    requests.load()
+
+startup.mark('imports')
+
 # Initialize Flask app
 app = Flask(__name__)
 app.secret_key = os.getenv('FLASK_SECRET_KEY', 'sa-portal-2026')
 CORS(app, resources={r"/*": {"origins": "*"}}, supports_credentials=True)
 
-# SA Timezone
-sa_timezone = pytz.timezone('Africa/Johannesburg')
+@app.before_request
+def note_request_start():
+    if startup.first_request is None:
+        g.request_started = time.perf_counter()
+
+@app.after_request
+def note_first_response(response):
+    if startup.first_request is None and startup.record_first_request(request.path, g.get('request_started')):
+        if LAZY_STARTUP:
+            response.call_on_close(finish_startup)
+    return response
+
+# SA Timezone - Africa/Johannesburg has not observed DST since 1944, so a fixed
+# UTC+2 offset is exact and avoids tz database lookups on every conversion
+SAST_OFFSET = 2 * 3600
+sa_timezone = timezone(timedelta(seconds=SAST_OFFSET), 'SAST')
 
 # =========== API KEYS ===========
 API_KEYS = {
@@ -36,26 +381,803 @@ API_KEYS = {
     'football_data': '601057ac05684f6fa4af02642d49555f',
 }
 
+# =========== UPSTREAM ENDPOINTS ===========
+# Overridable so benchmarks and local runs can point at a stand-in server
+UPSTREAM_URLS = {
+    'football_data': os.getenv('FOOTBALL_DATA_URL', 'https://api.football-data.org/v4').rstrip('/'),
+    'weather': os.getenv('OPENWEATHER_URL', 'https://api.openweathermap.org/data/2.5').rstrip('/'),
+    'google_geocode': os.getenv('GOOGLE_GEOCODE_URL', 'https://maps.googleapis.com/maps/api/geocode/json'),
+}
+
+# =========== UPSTREAM CLIENT ===========
+class UpstreamClient:
+    """
+    GETs to the upstream APIs with per-endpoint latency tracking and optional
+    hedging: when an attempt has not answered within the endpoint's rolling
+    p95, a second identical request is sent and whichever answers first wins.
+    Hedges are capped at `max_hedge_ratio` of requests so the extra quota is
+    bounded; the served vs. first-attempt percentiles show what it buys.
+    """
+    
+    def __init__(self, hedging=False, max_hedge_ratio=0.05, window=200, min_samples=20,
+                 min_delay=0.05, max_workers=16):
+        self.hedging = hedging
+        self.max_hedge_ratio = max_hedge_ratio
+        self.window = window
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='upstream')
+        self.lock = threading.Lock()
+        self.endpoints = {}
+    
+    def _endpoint(self, name):
+        endpoint = self.endpoints.get(name)
+        if endpoint is None:
+            with self.lock:
+                endpoint = self.endpoints.setdefault(name, {
+                    # First-attempt latencies drive the hedge delay; served
+                    # latencies are what callers actually waited
+                    'first': deque(maxlen=self.window),
+                    'served': deque(maxlen=self.window),
+                    'requests': 0,
+                    'hedged': 0,
+                    'hedge_wins': 0,
+                    'over_budget': 0,
+                })
+        return endpoint
+    
+    def hedge_delay(self, name):
+        """Rolling p95 of first attempts, or None until enough samples exist"""
+        samples = self._endpoint(name)['first']
+        if len(samples) < self.min_samples:
+            return None
+        return max(self.min_delay, percentile(sorted(samples), 0.95))
+    
+    def get(self, name, url, **kwargs):
+        """requests.get for an idempotent upstream call, hedged when enabled"""
+        endpoint = self._endpoint(name)
+        with self.lock:
+            endpoint['requests'] += 1
+        started = time.perf_counter()
+        delay = self.hedge_delay(name) if self.hedging else None
+        
+        if delay is None:
+            try:
+                return requests.get(url, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - started
+                endpoint['first'].append(elapsed)
+                endpoint['served'].append(elapsed)
+        
+        first = self.pool.submit(requests.get, url, **kwargs)
+        first.add_done_callback(lambda f: endpoint['first'].append(time.perf_counter() - started))
+        done, _ = wait([first], timeout=delay)
+        
+        if not done:
+            with self.lock:
+                allowed = endpoint['hedged'] + 1 <= self.max_hedge_ratio * endpoint['requests']
+                if allowed:
+                    endpoint['hedged'] += 1
+                else:
+                    endpoint['over_budget'] += 1
+            
+            if allowed:
+                second = self.pool.submit(requests.get, url, **kwargs)
+                pending = {first, second}
+                while pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    winner = next((f for f in done if f.exception() is None), None)
+                    if winner is not None:
+                        if winner is second:
+                            with self.lock:
+                                endpoint['hedge_wins'] += 1
+                        endpoint['served'].append(time.perf_counter() - started)
+                        return winner.result()
+        
+        try:
+            return first.result()
+        finally:
+            endpoint['served'].append(time.perf_counter() - started)
+    
+    def report(self):
+        report = {'hedging': self.hedging, 'max_hedge_ratio': self.max_hedge_ratio, 'endpoints': {}}
+        for name, endpoint in list(self.endpoints.items()):
+            first, served = sorted(endpoint['first']), sorted(endpoint['served'])
+            report['endpoints'][name] = {
+                'requests': endpoint['requests'],
+                'hedged': endpoint['hedged'],
+                'hedge_rate': round(endpoint['hedged'] / endpoint['requests'], 4) if endpoint['requests'] else 0,
+                'hedge_wins': endpoint['hedge_wins'],
+                'over_budget': endpoint['over_budget'],
+                'hedge_delay_ms': round((self.hedge_delay(name) or 0) * 1000, 1),
+                'first_attempt_ms': {p: round(percentile(first, q) * 1000, 1) for p, q in PERCENTILES},
+                'served_ms': {p: round(percentile(served, q) * 1000, 1) for p, q in PERCENTILES},
+            }
+        return report
+
+PERCENTILES = (('p50', 0.50), ('p95', 0.95), ('p99', 0.99))
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+upstream = UpstreamClient(
+    hedging=os.getenv('UPSTREAM_HEDGING', '0') == '1',
+    max_hedge_ratio=float(os.getenv('UPSTREAM_HEDGE_MAX_RATIO', 0.05)),
+)
+
+# =========== FOOTBALL COMPETITIONS ===========
+# Competitions covered by the football-data.org free tier that have league tables
+FOOTBALL_COMPETITIONS = {
+    'PL': 'Premier League',
+    'ELC': 'Championship',
+    'PD': 'La Liga',
+    'SA': 'Serie A',
+    'BL1': 'Bundesliga',
+    'FL1': 'Ligue 1',
+    'DED': 'Eredivisie',
+    'PPL': 'Primeira Liga',
+    'BSA': 'Brasileirão Série A',
+    'CL': 'UEFA Champions League',
+}
+
+# Standings are refreshed shortly after each final whistle, plus a staggered
+# background sweep; the grace period covers scheduler jitter so the request
+# path never has to refetch
+STANDINGS_REFRESH_PERIOD = int(os.getenv('STANDINGS_REFRESH_PERIOD', 6 * 3600))
+STANDINGS_MAX_AGE = STANDINGS_REFRESH_PERIOD + 300
+
+# =========== SA TIME FORMATTING ===========
+class SastTime(NamedTuple):
+    date: str
+    time: str
+    hour: str
+    day: str
+    month_day: str
+
+@lru_cache(maxsize=8192)
+def sast_strings(timestamp):
+    """Format a UNIX timestamp in SAST once; kickoffs and forecast slots repeat constantly"""
+    dt = datetime.fromtimestamp(timestamp, sa_timezone)
+    return SastTime(
+        date=dt.strftime('%Y-%m-%d'),
+        time=dt.strftime('%H:%M'),
+        hour=dt.strftime('%I %p').lstrip('0'),
+        day=dt.strftime('%a'),
+        month_day=dt.strftime('%b %d'),
+    )
+
+@lru_cache(maxsize=8192)
+def parse_utc_timestamp(utc_date):
+    """Parse an ISO 8601 UTC string such as '2026-01-01T15:00:00Z' into a UNIX timestamp"""
+    return int(datetime.fromisoformat(utc_date.replace('Z', '+00:00')).timestamp())
+
+def sast_strings_bulk(timestamps):
+    """Format many timestamps, converting each distinct value only once"""
+    formatted = {timestamp: sast_strings(timestamp) for timestamp in set(timestamps)}
+    return [formatted[timestamp] for timestamp in timestamps]
+
+# =========== COMPACT RECORDS ===========
+class CompactRecord:
+    """Slot-based record that still supports dict-style reads"""
+    __slots__ = ()
+    
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+    
+    def __getitem__(self, key):
+        return getattr(self, key)
+    
+    def get(self, key, default=None):
+        return getattr(self, key, default)
+
+@dataclass(slots=True)
+class MatchRecord(CompactRecord):
+    id: int
+    home_team: str
+    away_team: str
+    score: str
+    status: str
+    is_live: bool
+    date: str
+    time: str
+    venue: str
+    competition: str
+    competition_code: str
+    matchday: int
+    minute: object = None
+    
+    def to_dict(self):
+        # Only live matches carry a minute, as the plain dicts always did
+        record = CompactRecord.to_dict(self)
+        if self.minute is None:
+            del record['minute']
+        return record
+
+@dataclass(slots=True)
+class StandingRecord(CompactRecord):
+    position: int
+    team: str
+    played: int
+    won: int
+    drawn: int
+    lost: int
+    goals_for: int
+    goals_against: int
+    goal_difference: int
+    points: int
+    form: str
+
+@dataclass(slots=True)
+class HourlyForecast(CompactRecord):
+    time: str
+    temp: int
+    feels_like: int
+    description: str
+    icon: str
+    humidity: int
+    wind_speed: float
+    pop: int
+    clouds: int
+
+@dataclass(slots=True)
+class DailyForecast(CompactRecord):
+    date: str
+    day: str
+    month_day: str
+    temp: int
+    temp_min: int
+    temp_max: int
+    icon: str
+    description: str
+    pop: int = 0
+
+# =========== JSON ENCODING ===========
+def _json_default(obj):
+    if isinstance(obj, CompactRecord):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def encode_json(data):
+    """Encode to JSON bytes, using orjson when it is installed"""
+    if orjson is not None:
+        # Records go through to_dict() rather than orjson's own dataclass encoding
+        return orjson.dumps(data, default=_json_default, option=orjson.OPT_PASSTHROUGH_DATACLASS)
+    return json.dumps(data, default=_json_default, separators=(',', ':')).encode('utf-8')
+
+def extend_json(payload, extra):
+    """Append keys to an encoded JSON object without decoding it"""
+    if not extra:
+        return payload
+    return payload[:-1] + b',' + encode_json(extra)[1:]
+
+def json_response(data, status=200):
+    """Build a JSON response from a dict or pre-encoded bytes"""
+    if not isinstance(data, bytes):
+        data = encode_json(data)
+    return Response(data, status=status, mimetype='application/json')
+
 # =========== CACHE SYSTEM ===========
+# How long a failed upstream lookup is remembered, per key family
+NEGATIVE_TTLS = {
+    'football': int(os.getenv('NEGATIVE_TTL_FOOTBALL', 60)),
+    'weather': int(os.getenv('NEGATIVE_TTL_WEATHER', 120)),
+    'geocode': int(os.getenv('NEGATIVE_TTL_GEOCODE', 600)),
+}
+
+# Key prefixes reported (and invalidated) as one family
+CACHE_FAMILIES = (
+    'football_live', 'football_todays', 'football_upcoming', 'football_standings', 'football_request',
+    'weather_forecast', 'weather_current', 'weather_city', 'weather_point', 'reverse', 'sassa_payment_dates',
+)
+
+def cache_family(key):
+    return next((family for family in CACHE_FAMILIES if key.startswith(family)), key.split('_', 1)[0])
+
 class CacheSystem:
+    # Retention for entries stored without an explicit TTL
+    DEFAULT_TTL = 3600
+    
     def __init__(self):
         self.cache = {}
+        self.ttls = {}
+        self.encoded = {}
+        self.version = 0
+        # Failed lookups live apart from real data so get() can never serve one
+        self.negative = {}
+        self.negative_stats = {}
+        # family -> [hits, misses], and key -> its family's counters so a
+        # lookup costs one dict get
+        self.lookups = {}
+        self.key_counters = {}
     
-    def get(self, key, max_age=300):
+    def get(self, key, max_age=300, encoded=False):
+        # max_age=None honours the TTL the entry was stored with
+        counts = self.key_counters.get(key) or self._counters(key)
         if key in self.cache:
             data, timestamp = self.cache[key]
+            if max_age is None:
+                max_age = self.ttls.get(key, self.DEFAULT_TTL)
             if time.time() - timestamp < max_age:
+                counts[0] += 1
+                if encoded:
+                    return self._encode(key, data, timestamp)
                 return data
+        counts[1] += 1
         return None
     
-    def set(self, key, data):
+    def _counters(self, key):
+        if len(self.key_counters) >= 20000:
+            self.key_counters.clear()
+        counts = self.key_counters[key] = self.lookups.setdefault(cache_family(key), [0, 0])
+        return counts
+    
+    def _encode(self, key, data, timestamp):
+        # Encode each entry version once; every later hit reuses the bytes
+        entry = self.encoded.get(key)
+        if entry is None or entry[0] != timestamp:
+            entry = (timestamp, encode_json({**data, 'cached': True}))
+            self.encoded[key] = entry
+        return entry[1]
+    
+    def age(self, key):
+        """Seconds since the entry was stored, or None if there is none"""
+        entry = self.cache.get(key)
+        if entry is None:
+            return None
+        return time.time() - entry[1]
+    
+    def set(self, key, data, ttl=None):
         self.cache[key] = (data, time.time())
+        self.ttls[key] = ttl or self.DEFAULT_TTL
+        self.encoded.pop(key, None)
+        self.negative.pop(key, None)
+        self.version += 1
     
     def clear(self):
         self.cache.clear()
+        self.ttls.clear()
+        self.encoded.clear()
+        self.negative.clear()
+        self.version += 1
+    
+    def set_negative(self, key, reason, ttl):
+        """Remember that fetching `key` failed, so callers skip upstream until `ttl` passes"""
+        now = time.time()
+        if len(self.negative) >= 1000:
+            for stale in [k for k, (_, expires) in self.negative.items() if expires <= now]:
+                del self.negative[stale]
+        self.negative[key] = (reason, now + ttl)
+        self._negative_count(key, 'stores')
+    
+    def get_negative(self, key):
+        """Return the failure reason while a negative entry is live, else None"""
+        entry = self.negative.get(key)
+        if entry is None:
+            return None
+        if time.time() >= entry[1]:
+            self.negative.pop(key, None)
+            return None
+        self._negative_count(key, 'hits')
+        return entry[0]
+    
+    def _negative_count(self, key, counter):
+        family = key.split('_', 1)[0]
+        stats = self.negative_stats.get(family)
+        if stats is None:
+            stats = self.negative_stats[family] = {'stores': 0, 'hits': 0}
+        stats[counter] += 1
+    
+    def negative_report(self):
+        now = time.time()
+        live = {}
+        for key, (reason, expires) in list(self.negative.items()):
+            if expires > now:
+                family = key.split('_', 1)[0]
+                live[family] = live.get(family, 0) + 1
+        return {
+            family: dict(stats, entries=live.get(family, 0))
+            for family, stats in self.negative_stats.items()
+        }
+    
+    def entries(self):
+        """Yield (key, data, timestamp, ttl) for every entry that has not expired"""
+        now = time.time()
+        for key, (data, timestamp) in list(self.cache.items()):
+            ttl = self.ttls.get(key, self.DEFAULT_TTL)
+            if now - timestamp < ttl:
+                yield key, data, timestamp, ttl
+    
+    def restore(self, key, data, timestamp, ttl):
+        """Load an entry with its original timestamp, e.g. from a snapshot"""
+        self.cache[key] = (data, timestamp)
+        self.ttls[key] = ttl
+    
+    def merge(self, entries):
+        """Restore entries that are newer than what this cache holds; returns how many"""
+        merged = 0
+        for key, data, timestamp, ttl in entries:
+            current = self.cache.get(key)
+            if current is None or current[1] < timestamp:
+                self.restore(key, data, timestamp, ttl)
+                merged += 1
+        if merged:
+            self.version += 1
+        return merged
+    
+    def invalidate(self, keys=(), prefixes=(), before=None):
+        """
+        Drop the given keys and every key under the given prefixes, including
+        their negative entries. With `before`, entries stored at or after that
+        time survive. Returns the number of entries removed.
+        """
+        keys = set(keys)
+        prefixes = tuple(prefixes)
+        
+        def matches(key):
+            return key in keys or (prefixes and key.startswith(prefixes))
+        
+        removed = 0
+        for key, (_, timestamp) in list(self.cache.items()):
+            if matches(key) and (before is None or timestamp < before):
+                self.cache.pop(key, None)
+                self.ttls.pop(key, None)
+                self.encoded.pop(key, None)
+                removed += 1
+        for key in [key for key in list(self.negative) if matches(key)]:
+            self.negative.pop(key, None)
+        
+        if removed:
+            self.version += 1
+        return removed
+    
+    def family_report(self):
+        """Entry count, JSON size, ages and hit rate per key family"""
+        now = time.time()
+        families = {}
+        for key, (data, timestamp) in list(self.cache.items()):
+            family = families.setdefault(cache_family(key), {'entries': 0, 'expired': 0, 'bytes': 0, 'ages': []})
+            family['entries'] += 1
+            encoded = self.encoded.get(key)
+            family['bytes'] += len(encoded[1]) if encoded else len(encode_json(data))
+            age = now - timestamp
+            family['ages'].append(age)
+            if age >= self.ttls.get(key, self.DEFAULT_TTL):
+                family['expired'] += 1
+        
+        for name in list(self.lookups):
+            families.setdefault(name, {'entries': 0, 'expired': 0, 'bytes': 0, 'ages': []})
+        
+        report = {}
+        for name, family in sorted(families.items()):
+            ages = family.pop('ages')
+            hits, misses = self.lookups.get(name, (0, 0))
+            report[name] = dict(
+                family,
+                oldest_s=round(max(ages)) if ages else None,
+                newest_s=round(min(ages)) if ages else None,
+                hits=hits,
+                misses=misses,
+                hit_ratio=round(hits / (hits + misses), 3) if hits + misses else None,
+            )
+        return report
 
 cache = CacheSystem()
 
+# =========== CACHE SNAPSHOT ===========
+# Local state (snapshots, stores) lives in Flask's instance folder unless
+# STATE_DIR points somewhere persistent, e.g. a Render disk
+STATE_DIR = os.getenv('STATE_DIR', app.instance_path)
+
+class CacheSnapshot:
+    """
+    Persist the cache to a local file so a fresh worker starts warm after a
+    restart or deploy. The file is a magic header followed by a zlib-compressed
+    pickle of (key, data, timestamp, ttl) tuples; expired entries are dropped
+    both when saving and when loading.
+    """
+    
+    MAGIC = b'SAPC1'
+    
+    def __init__(self, cache_system, path, interval=300):
+        self.cache = cache_system
+        self.path = path
+        self.interval = interval
+        self.saved_version = None
+        self.thread = None
+        self.lock = threading.Lock()
+    
+    def save(self):
+        """Write the snapshot atomically; returns the number of entries saved"""
+        with self.lock:
+            version = self.cache.version
+            entries = list(self.cache.entries())
+            payload = self.MAGIC + zlib.compress(pickle.dumps((time.time(), entries), protocol=pickle.HIGHEST_PROTOCOL))
+            
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(payload)
+            os.replace(tmp_path, self.path)
+            
+            self.saved_version = version
+            return len(entries)
+    
+    def load(self):
+        """Restore unexpired entries; returns the number loaded"""
+        try:
+            with open(self.path, 'rb') as f:
+                payload = f.read()
+        except FileNotFoundError:
+            return 0
+        
+        if not payload.startswith(self.MAGIC):
+            logger.error(f"Ignoring cache snapshot with unknown format: {self.path}")
+            return 0
+        
+        try:
+            saved_at, entries = pickle.loads(zlib.decompress(payload[len(self.MAGIC):]))
+        except Exception as e:
+            logger.error(f"Cache snapshot load error: {str(e)}")
+            return 0
+        
+        now = time.time()
+        loaded = 0
+        for key, data, timestamp, ttl in entries:
+            if now - timestamp < ttl and key not in self.cache.cache:
+                self.cache.restore(key, data, timestamp, ttl)
+                loaded += 1
+        
+        self.saved_version = self.cache.version
+        logger.info(f"Restored {loaded} of {len(entries)} cache entries from snapshot ({int(now - saved_at)}s old)")
+        return loaded
+    
+    def save_quietly(self):
+        try:
+            if self.cache.version != self.saved_version:
+                self.save()
+        except Exception as e:
+            logger.error(f"Cache snapshot save error: {str(e)}")
+    
+    def start(self):
+        if self.thread is None or not self.thread.is_alive():
+            self.thread = threading.Thread(target=self._run, name='cache-snapshot', daemon=True)
+            self.thread.start()
+    
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            self.save_quietly()
+
+cache_snapshot = CacheSnapshot(
+    cache,
+    os.getenv('CACHE_SNAPSHOT_PATH', os.path.join(STATE_DIR, 'cache_snapshot.bin')),
+    interval=int(os.getenv('CACHE_SNAPSHOT_INTERVAL', 300)),
+)
+
+# =========== CACHE COMMANDS ===========
+class CacheBus:
+    """
+    Invalidations and refreshed entries shared with the other workers on the
+    host through a SQLite log. Workers pick up new commands from the request
+    path at most once per `poll_interval`. An invalidation only removes
+    entries stored before the command was issued, so replaying the retained
+    log after a snapshot restore, or applying a command twice, is harmless.
+    """
+    
+    def __init__(self, cache_system, path, poll_interval=2, retention=86400):
+        self.cache = cache_system
+        self.path = path
+        self.poll_interval = poll_interval
+        self.retention = retention
+        self.lock = threading.Lock()
+        self.conn = None
+        self.last_id = 0
+        self.checked = 0
+        self.applied = 0
+    
+    def _connect(self):
+        if self.conn is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS commands (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    created REAL NOT NULL,
+                    body BLOB NOT NULL
+                )
+            ''')
+            self.conn = conn
+        return self.conn
+    
+    def publish(self, command):
+        """Apply a command here and log it for the other workers"""
+        command = dict(command, created=command.get('created') or time.time())
+        result = self.apply(command)
+        with self.lock:
+            conn = self._connect()
+            conn.execute('INSERT INTO commands (created, body) VALUES (?, ?)',
+                         (command['created'], zlib.compress(pickle.dumps(command, protocol=pickle.HIGHEST_PROTOCOL))))
+            conn.execute('DELETE FROM commands WHERE created < ?', (time.time() - self.retention,))
+        return result
+    
+    def apply(self, command):
+        self.applied += 1
+        if command['action'] == 'invalidate':
+            return self.cache.invalidate(command.get('keys', ()), command.get('prefixes', ()), before=command['created'])
+        if command['action'] == 'merge':
+            return self.cache.merge(command['entries'])
+        logger.error(f"Unknown cache command: {command['action']}")
+        return 0
+    
+    def poll(self, force=False):
+        """Apply commands other workers published since the last poll"""
+        now = time.time()
+        if not force and now - self.checked < self.poll_interval:
+            return
+        self.checked = now
+        
+        with self.lock:
+            rows = self._connect().execute('SELECT id, body FROM commands WHERE id > ? ORDER BY id',
+                                           (self.last_id,)).fetchall()
+            if rows:
+                self.last_id = rows[-1][0]
+        for _, body in rows:
+            try:
+                self.apply(pickle.loads(zlib.decompress(body)))
+            except Exception as e:
+                logger.error(f"Cache command error: {str(e)}")
+    
+    def report(self):
+        return {'last_id': self.last_id, 'applied': self.applied, 'poll_interval': self.poll_interval}
+
+cache_bus = CacheBus(
+    cache,
+    os.getenv('CACHE_COMMANDS_PATH', os.path.join(STATE_DIR, 'cache_commands.sqlite3')),
+    poll_interval=float(os.getenv('CACHE_COMMANDS_POLL', 2)),
+)
+
+@app.before_request
+def sync_cache_commands():
+    try:
+        cache_bus.poll()
+    except sqlite3.Error as e:
+        logger.error(f"Cache command poll error: {str(e)}")
+
+# =========== MATCH SCHEDULE ===========
+# A match occupies roughly kickoff - 5 min to kickoff + 2h including stoppages
+MATCH_WINDOW_BEFORE = 300
+MATCH_WINDOW_AFTER = 7200
+# football-data.org usually has the table updated a few minutes after full time
+STANDINGS_AFTER_WHISTLE = 300
+IN_PLAY_STATUSES = ('LIVE', 'IN_PLAY', 'PAUSED')
+CLOSED_STATUSES = ('FINISHED', 'POSTPONED', 'CANCELLED', 'SUSPENDED', 'AWARDED')
+
+class MatchSchedule:
+    """
+    Kickoff times learned from every fixtures response. Cache TTLs are sized
+    from it: short while a match is on or about to start, long otherwise, and
+    live scores are not polled at all outside match windows. It also spots
+    final whistles so standings can be refreshed right after them.
+    """
+    
+    def __init__(self):
+        self.matches = {}
+        self.ended = set()
+        self.pending_standings = {}
+        self.known_until = 0
+        self.lock = threading.Lock()
+    
+    def observe(self, raw_matches, covers_until=None):
+        """Record matches from an upstream response; covers_until marks the schedule complete up to then"""
+        now = time.time()
+        with self.lock:
+            for match in raw_matches:
+                if not match.get('utcDate'):
+                    continue
+                match_id = match.get('id')
+                status = match.get('status', 'SCHEDULED')
+                code = match.get('competition', {}).get('code')
+                self.matches[match_id] = (parse_utc_timestamp(match['utcDate']), code, status)
+                if status == 'FINISHED':
+                    self._ended(match_id, code, now)
+            
+            if covers_until:
+                self.known_until = max(self.known_until, covers_until)
+            
+            # Forget matches from previous days
+            for match_id in [i for i, m in self.matches.items() if m[0] < now - 2 * 86400]:
+                del self.matches[match_id]
+                self.ended.discard(match_id)
+    
+    def observe_live(self, raw_matches):
+        """A match that was in play and has left the live feed has finished"""
+        self.observe(raw_matches)
+        live_ids = {match.get('id') for match in raw_matches}
+        now = time.time()
+        with self.lock:
+            for match_id, (kickoff, code, status) in list(self.matches.items()):
+                if status in IN_PLAY_STATUSES and match_id not in live_ids:
+                    self.matches[match_id] = (kickoff, code, 'FINISHED')
+                    self._ended(match_id, code, now)
+    
+    def _ended(self, match_id, code, at):
+        if match_id in self.ended or not code:
+            return
+        self.ended.add(match_id)
+        due = at + STANDINGS_AFTER_WHISTLE
+        self.pending_standings[code] = max(self.pending_standings.get(code, 0), due)
+    
+    def standings_due(self, now):
+        """Pop competitions whose table should be refetched after a final whistle"""
+        with self.lock:
+            # Matches nobody watched finish are assumed over once their window closes
+            for match_id, (kickoff, code, status) in self.matches.items():
+                if kickoff + MATCH_WINDOW_AFTER <= now and match_id not in self.ended:
+                    self._ended(match_id, code, kickoff + MATCH_WINDOW_AFTER)
+            
+            due = [code for code, at in self.pending_standings.items() if at <= now]
+            for code in due:
+                del self.pending_standings[code]
+        return due
+    
+    def known(self, now):
+        return now < self.known_until
+    
+    def in_window(self, now):
+        return any(
+            status in IN_PLAY_STATUSES or kickoff - MATCH_WINDOW_BEFORE <= now <= kickoff + MATCH_WINDOW_AFTER
+            for kickoff, code, status in self.matches.values()
+            if status not in CLOSED_STATUSES
+        )
+    
+    def next_kickoff(self, now):
+        upcoming = [kickoff for kickoff, code, status in self.matches.values()
+                    if kickoff > now and status not in CLOSED_STATUSES]
+        return min(upcoming) if upcoming else None
+    
+    def live_possible(self, now):
+        """False only when the schedule is known and no match is on or imminent"""
+        return not self.known(now) or self.in_window(now)
+    
+    def ttl(self, peak, off_peak, default, now=None):
+        """
+        Cache lifetime for match data: `peak` inside a match window, otherwise
+        until shortly before the next kickoff (at most `off_peak`), and the old
+        fixed `default` while the schedule is not known yet.
+        """
+        now = now or time.time()
+        if not self.known(now):
+            return default
+        if self.in_window(now):
+            return peak
+        
+        horizon = self.known_until - now
+        next_kickoff = self.next_kickoff(now)
+        if next_kickoff is not None:
+            horizon = min(horizon, next_kickoff - MATCH_WINDOW_BEFORE - now)
+        return int(max(peak, min(off_peak, horizon)))
+    
+    def report(self):
+        now = time.time()
+        next_kickoff = self.next_kickoff(now)
+        return {
+            'matches': len(self.matches),
+            'known_until': datetime.fromtimestamp(self.known_until, sa_timezone).isoformat() if self.known_until else None,
+            'in_window': self.in_window(now),
+            'next_kickoff': datetime.fromtimestamp(next_kickoff, sa_timezone).isoformat() if next_kickoff else None,
+            'pending_standings': sorted(self.pending_standings),
+        }
+
+def end_of_day():
+    """Timestamp of the coming local midnight"""
+    midnight = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    return (midnight + timedelta(days=1)).timestamp()
+
+match_schedule = MatchSchedule()
+
 # =========== FOOTBALL DATA SERVICE ===========
 class FootballDataService:
     """Get 2026 European football data"""
@@ -69,50 +1191,78 @@ class FootballDataService:
     
     @staticmethod
     def make_api_request(url, params=None, retries=2):
+        negative_key = f"football_request_{url}?{sorted((params or {}).items())}"
+        if cache.get_negative(negative_key):
+            return None
+        
         headers = FootballDataService.get_headers()
+        name = f"football/{url.rsplit('/', 1)[-1]}"
+        failure = 'no response'
         
         for attempt in range(retries + 1):
             try:
                 timeout = 8 if attempt == 0 else 15
-                response = requests.get(url, headers=headers, params=params, timeout=timeout, verify=False)
+                started = time.perf_counter()
+                response = upstream.get(name, url, headers=headers, params=params, timeout=timeout, verify=False)
                 
                 if response.status_code == 200:
                     return response.json()
                 elif response.status_code == 429:
                     time.sleep(1)
                 else:
-                    logger.error(f"API error {response.status_code}")
+                    logger.error(f"API error {response.status_code}", extra={
+                        'upstream': name, 'attempt': attempt, 'status': response.status_code,
+                        'latency_ms': round((time.perf_counter() - started) * 1000, 1),
+                    })
+                failure = f"status {response.status_code}"
                     
             except requests.exceptions.Timeout:
                 if attempt < retries:
                     time.sleep(0.5)
                     continue
                 else:
+                    cache.set_negative(negative_key, 'timeout', NEGATIVE_TTLS['football'])
                     raise
             except requests.exceptions.RequestException as e:
                 if attempt < retries:
                     time.sleep(0.5)
                     continue
                 else:
+                    cache.set_negative(negative_key, type(e).__name__, NEGATIVE_TTLS['football'])
                     raise
         
+        cache.set_negative(negative_key, failure, NEGATIVE_TTLS['football'])
         return None
     
     @staticmethod
-    def get_live_matches():
+    def get_live_matches(as_json=False):
         cache_key = "football_live_matches"
-        cached = cache.get(cache_key, 60)
+        cached = cache.get(cache_key, None, encoded=as_json)
         if cached:
-            cached['cached'] = True
+            if not as_json:
+                cached['cached'] = True
             return cached
         
+        # Nothing is on or about to start: answer without polling upstream
+        if not match_schedule.live_possible(time.time()):
+            result = {
+                'success': True,
+                'matches': [],
+                'total': 0,
+                'last_updated': datetime.now().isoformat(),
+                'source': 'schedule'
+            }
+            cache.set(cache_key, result, ttl=match_schedule.ttl(60, 3600, 60))
+            return result
+        
         try:
-            url = "https://api.football-data.org/v4/matches"
+            url = f"{UPSTREAM_URLS['football_data']}/matches"
             params = {'status': 'LIVE'}
             
             data = FootballDataService.make_api_request(url, params)
             
             if data:
+                match_schedule.observe_live(data.get('matches', []))
                 matches = FootballDataService._process_matches_data(data)
                 
                 result = {
@@ -123,11 +1273,11 @@ class FootballDataService:
                     'source': 'Football-Data.org'
                 }
                 
-                cache.set(cache_key, result)
+                cache.set(cache_key, result, ttl=match_schedule.ttl(60, 3600, 60))
                 return result
             
         except Exception as e:
-            logger.error(f"Live matches error: {str(e)}")
+            logger.error(f"Live matches error: {str(e)}", extra={'cache_key': cache_key, 'upstream': 'football'})
         
         return {
             'success': True,
@@ -137,21 +1287,23 @@ class FootballDataService:
         }
     
     @staticmethod
-    def get_todays_matches():
+    def get_todays_matches(as_json=False):
         cache_key = "football_todays_matches"
-        cached = cache.get(cache_key, 300)
+        cached = cache.get(cache_key, None, encoded=as_json)
         if cached:
-            cached['cached'] = True
+            if not as_json:
+                cached['cached'] = True
             return cached
         
         try:
-            url = "https://api.football-data.org/v4/matches"
+            url = f"{UPSTREAM_URLS['football_data']}/matches"
             today = datetime.now().strftime('%Y-%m-%d')
             params = {'dateFrom': today, 'dateTo': today}
             
             data = FootballDataService.make_api_request(url, params)
             
             if data:
+                match_schedule.observe(data.get('matches', []), covers_until=end_of_day())
                 matches = FootballDataService._process_matches_data(data)
                 
                 result = {
@@ -162,11 +1314,11 @@ class FootballDataService:
                     'last_updated': datetime.now().isoformat(),
                 }
                 
-                cache.set(cache_key, result)
+                cache.set(cache_key, result, ttl=match_schedule.ttl(60, 1800, 300))
                 return result
             
         except Exception as e:
-            logger.error(f"Today matches error: {str(e)}")
+            logger.error(f"Today matches error: {str(e)}", extra={'cache_key': cache_key, 'upstream': 'football'})
         
         return {
             'success': True,
@@ -177,15 +1329,20 @@ class FootballDataService:
         }
     
     @staticmethod
-    def get_standings():
-        cache_key = "football_standings"
-        cached = cache.get(cache_key, 3600)
-        if cached:
-            cached['cached'] = True
-            return cached
+    def get_standings(competition='PL', force_refresh=False, as_json=False):
+        competition = competition.upper()
+        competition_name = FOOTBALL_COMPETITIONS.get(competition, competition)
+        cache_key = f"football_standings_{competition}"
+        
+        if not force_refresh:
+            cached = cache.get(cache_key, STANDINGS_MAX_AGE, encoded=as_json)
+            if cached:
+                if not as_json:
+                    cached['cached'] = True
+                return cached
         
         try:
-            url = "https://api.football-data.org/v4/competitions/PL/standings"
+            url = f"{UPSTREAM_URLS['football_data']}/competitions/{competition}/standings"
             
             data = FootballDataService.make_api_request(url)
             
@@ -196,33 +1353,64 @@ class FootballDataService:
                     'success': True,
                     'standings': standings,
                     'last_updated': datetime.now().isoformat(),
-                    'competition': 'Premier League',
+                    'competition': competition_name,
+                    'competition_code': competition,
                     'season': data.get('season', {}).get('currentMatchday', 1),
                 }
                 
-                cache.set(cache_key, result)
+                cache.set(cache_key, result, ttl=STANDINGS_MAX_AGE)
                 return result
             
         except Exception as e:
-            logger.error(f"Standings error: {str(e)}")
+            logger.error(f"Standings error ({competition}): {str(e)}", extra={'cache_key': cache_key, 'upstream': 'football'})
         
         return {
             'success': True,
             'standings': [],
             'last_updated': datetime.now().isoformat(),
-            'competition': 'Premier League',
+            'competition': competition_name,
+            'competition_code': competition,
+        }
+    
+    @staticmethod
+    def get_all_standings(as_json=False):
+        """Combine every competition's standings straight from cache, never calling upstream"""
+        competitions = {}
+        pending = []
+        
+        for code, name in FOOTBALL_COMPETITIONS.items():
+            cached = cache.get(f"football_standings_{code}", STANDINGS_MAX_AGE, encoded=as_json)
+            if cached:
+                competitions[code] = cached
+            else:
+                pending.append(code)
+        
+        result = {
+            'success': True,
+            'pending': pending,
+            'total': len(competitions),
+            'last_updated': datetime.now().isoformat(),
         }
+        
+        if not as_json:
+            result['competitions'] = competitions
+            return result
+        
+        # Splice the per-competition bytes together instead of re-encoding them
+        parts = b','.join(encode_json(code) + b':' + payload for code, payload in competitions.items())
+        return encode_json(result)[:-1] + b',"competitions":{' + parts + b'}}'
     
     @staticmethod
-    def get_upcoming_fixtures():
+    def get_upcoming_fixtures(as_json=False):
         cache_key = "football_upcoming_fixtures"
-        cached = cache.get(cache_key, 600)
+        cached = cache.get(cache_key, None, encoded=as_json)
         if cached:
-            cached['cached'] = True
+            if not as_json:
+                cached['cached'] = True
             return cached
         
         try:
-            url = "https://api.football-data.org/v4/matches"
+            url = f"{UPSTREAM_URLS['football_data']}/matches"
             
             today = datetime.now()
             next_week = today + timedelta(days=7)
@@ -236,6 +1424,7 @@ class FootballDataService:
             data = FootballDataService.make_api_request(url, params)
             
             if data:
+                match_schedule.observe(data.get('matches', []))
                 matches = FootballDataService._process_matches_data(data, upcoming=True)
                 
                 result = {
@@ -246,11 +1435,11 @@ class FootballDataService:
                     'last_updated': datetime.now().isoformat(),
                 }
                 
-                cache.set(cache_key, result)
+                cache.set(cache_key, result, ttl=match_schedule.ttl(300, 3600, 600))
                 return result
             
         except Exception as e:
-            logger.error(f"Fixtures error: {str(e)}")
+            logger.error(f"Fixtures error: {str(e)}", extra={'cache_key': cache_key, 'upstream': 'football'})
         
         return {
             'success': True,
@@ -305,33 +1494,28 @@ class FootballDataService:
                 
                 if utc_date:
                     try:
-                        dt = datetime.fromisoformat(utc_date.replace('Z', '+00:00'))
-                        sa_dt = dt.astimezone(sa_timezone)
-                        match_date = sa_dt.strftime('%Y-%m-%d')
-                        match_time = sa_dt.strftime('%H:%M')
+                        kickoff = sast_strings(parse_utc_timestamp(utc_date))
+                        match_date = kickoff.date
+                        match_time = kickoff.time
                     except Exception:
                         match_date = datetime.now().strftime('%Y-%m-%d')
                         match_time = 'TBC'
                 
-                match_data = {
-                    'id': match.get('id'),
-                    'home_team': match.get('homeTeam', {}).get('name', 'Home Team'),
-                    'away_team': match.get('awayTeam', {}).get('name', 'Away Team'),
-                    'score': score_display,
-                    'status': match_status,
-                    'is_live': is_live,
-                    'date': match_date,
-                    'time': match_time,
-                    'venue': match.get('venue', 'Football Stadium'),
-                    'competition': competition.get('name', 'Football Match'),
-                    'competition_code': competition.get('code'),
-                    'matchday': match.get('matchday', 1)
-                }
-                
-                if minute:
-                    match_data['minute'] = minute
-                
-                matches.append(match_data)
+                matches.append(MatchRecord(
+                    id=match.get('id'),
+                    home_team=match.get('homeTeam', {}).get('name', 'Home Team'),
+                    away_team=match.get('awayTeam', {}).get('name', 'Away Team'),
+                    score=score_display,
+                    status=match_status,
+                    is_live=is_live,
+                    date=match_date,
+                    time=match_time,
+                    venue=match.get('venue', 'Football Stadium'),
+                    competition=competition.get('name', 'Football Match'),
+                    competition_code=competition.get('code'),
+                    matchday=match.get('matchday', 1),
+                    minute=minute or None,
+                ))
         
         return matches
     
@@ -340,75 +1524,434 @@ class FootballDataService:
         standings = []
         
         if 'standings' in data and len(data['standings']) > 0:
-            table = data['standings'][0].get('table', [])
+            # Leagues list TOTAL/HOME/AWAY tables; cups may only have group tables
+            total = [group for group in data['standings'] if group.get('type') == 'TOTAL']
+            table = (total or data['standings'])[0].get('table', [])
             
             for i, team_data in enumerate(table):
                 team = team_data.get('team', {})
                 stats = team_data
                 
-                standings.append({
-                    'position': stats.get('position', i + 1),
-                    'team': team.get('name', f'Team {i + 1}'),
-                    'played': stats.get('playedGames', 0),
-                    'won': stats.get('won', 0),
-                    'drawn': stats.get('draw', 0),
-                    'lost': stats.get('lost', 0),
-                    'goals_for': stats.get('goalsFor', 0),
-                    'goals_against': stats.get('goalsAgainst', 0),
-                    'goal_difference': stats.get('goalDifference', 0),
-                    'points': stats.get('points', 0),
-                    'form': stats.get('form', '-----')
-                })
+                standings.append(StandingRecord(
+                    position=stats.get('position', i + 1),
+                    team=team.get('name', f'Team {i + 1}'),
+                    played=stats.get('playedGames', 0),
+                    won=stats.get('won', 0),
+                    drawn=stats.get('draw', 0),
+                    lost=stats.get('lost', 0),
+                    goals_for=stats.get('goalsFor', 0),
+                    goals_against=stats.get('goalsAgainst', 0),
+                    goal_difference=stats.get('goalDifference', 0),
+                    points=stats.get('points', 0),
+                    form=stats.get('form', '-----'),
+                ))
         
         return standings
 
-# =========== LOCATION SERVICE ===========
-class LocationService:
+# =========== GEOCODE STORE ===========
+class GeocodeStore:
+    """
+    Long-lived reverse geocode results in SQLite, shared by every worker on the
+    host. Coordinates are snapped to a grid and the (cell_lat, cell_lon) primary
+    key doubles as the spatial index, so a miss on the exact cell can fall back
+    to the nearest neighbouring cell. Entries expire after `ttl` and the least
+    recently used ones are evicted when the file outgrows `max_bytes`.
+    """
     
-    @staticmethod
-    def reverse_geocode(lat: float, lon: float):
-        cache_key = f"reverse_{lat:.6f}_{lon:.6f}"
-        cached = cache.get(cache_key, 86400)
-        if cached:
-            return cached
+    # Refresh last-access times at most this often to keep reads write-free
+    TOUCH_INTERVAL = 3600
+    
+    def __init__(self, path, ttl=30 * 86400, max_bytes=50 * 1024 * 1024, decimals=4, neighbour_cells=1):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.scale = 10 ** decimals
+        self.neighbour_cells = neighbour_cells
+        self.lock = threading.Lock()
+        self.conn = None
+        self.writes_since_check = 0
+        self.stats = {'hits': 0, 'neighbour_hits': 0, 'misses': 0, 'expired': 0, 'writes': 0, 'evictions': 0}
+    
+    def _connect(self):
+        if self.conn is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS geocode (
+                    cell_lat INTEGER NOT NULL,
+                    cell_lon INTEGER NOT NULL,
+                    data TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created REAL NOT NULL,
+                    accessed REAL NOT NULL,
+                    PRIMARY KEY (cell_lat, cell_lon)
+                ) WITHOUT ROWID
+            ''')
+            conn.execute('CREATE INDEX IF NOT EXISTS geocode_accessed ON geocode (accessed)')
+            self.conn = conn
+        return self.conn
+    
+    def cell(self, lat, lon):
+        return round(lat * self.scale), round(lon * self.scale)
+    
+    def get(self, lat, lon):
+        """Return the stored location for the point's cell (or a neighbour), or None"""
+        cell_lat, cell_lon = self.cell(lat, lon)
+        radius = self.neighbour_cells
+        now = time.time()
         
-        try:
-            url = "https://maps.googleapis.com/maps/api/geocode/json"
-            params = {
-                'latlng': f"{lat},{lon}",
-                'key': API_KEYS['google_maps'],
-                'region': 'za',
-                'language': 'en',
-                'result_type': ['street_address', 'route', 'locality', 'sublocality', 'neighborhood']
-            }
+        with self.lock:
+            rows = self._connect().execute(
+                '''SELECT cell_lat, cell_lon, data, created, accessed FROM geocode
+                   WHERE cell_lat BETWEEN ? AND ? AND cell_lon BETWEEN ? AND ?''',
+                (cell_lat - radius, cell_lat + radius, cell_lon - radius, cell_lon + radius)
+            ).fetchall()
             
-            response = requests.get(url, params=params, timeout=5, verify=False)
+            fresh = [row for row in rows if now - row[3] < self.ttl]
+            if len(fresh) < len(rows):
+                self.stats['expired'] += len(rows) - len(fresh)
+            if not fresh:
+                self.stats['misses'] += 1
+                return None
             
-            if response.status_code == 200:
-                data = response.json()
-                if data['status'] == 'OK' and data['results']:
-                    # Try to get the best possible location name
-                    location_name = LocationService._extract_best_location_name(data['results'], lat, lon)
-                    
-                    location_data = {
-                        'name': location_name,
-                        'formatted_address': data['results'][0]['formatted_address'],
-                        'latitude': lat,
-                        'longitude': lon,
-                        'success': True,
-                        'accuracy': LocationService._determine_accuracy(data['results'])
-                    }
-                    
-                    cache.set(cache_key, location_data)
-                    return location_data
+            best = min(fresh, key=lambda row: (row[0] - cell_lat) ** 2 + (row[1] - cell_lon) ** 2)
+            if (best[0], best[1]) == (cell_lat, cell_lon):
+                self.stats['hits'] += 1
+            else:
+                self.stats['neighbour_hits'] += 1
+            
+            if now - best[4] > self.TOUCH_INTERVAL:
+                self.conn.execute('UPDATE geocode SET accessed = ? WHERE cell_lat = ? AND cell_lon = ?',
+                                  (now, best[0], best[1]))
         
-        except Exception as e:
-            logger.error(f"Reverse geocoding error: {str(e)}")
+        return json.loads(best[2])
+    
+    def put(self, lat, lon, location, created=None):
+        """Store a location for the point's cell, replacing any older entry"""
+        self.put_many([(lat, lon, location, created)])
+    
+    def put_many(self, items):
+        now = time.time()
+        rows = []
+        for lat, lon, location, created in items:
+            data = json.dumps(location, separators=(',', ':'))
+            rows.append((*self.cell(lat, lon), data, len(data), created or now, now))
         
-        # Fallback to coordinates if geocoding fails
-        return {
-            'name': f"Location ({lat:.4f}, {lon:.4f})",
-            'formatted_address': f"Latitude: {lat:.4f}, Longitude: {lon:.4f}",
+        with self.lock:
+            conn = self._connect()
+            conn.execute('BEGIN')
+            conn.executemany('INSERT OR REPLACE INTO geocode VALUES (?, ?, ?, ?, ?, ?)', rows)
+            conn.execute('COMMIT')
+            self.stats['writes'] += len(rows)
+            self.writes_since_check += len(rows)
+            if self.writes_since_check >= 100 or len(rows) > 1:
+                self._enforce_limits()
+        return len(rows)
+    
+    def _enforce_limits(self):
+        """Drop expired entries, then least recently used ones until under budget"""
+        self.writes_since_check = 0
+        conn = self.conn
+        deleted = conn.execute('DELETE FROM geocode WHERE created < ?', (time.time() - self.ttl,)).rowcount
+        
+        total = conn.execute('SELECT COALESCE(SUM(size), 0) FROM geocode').fetchone()[0]
+        if total > self.max_bytes:
+            # Row sizes exclude SQLite overhead, so trim to 90% of the budget
+            excess = total - self.max_bytes * 0.9
+            victims = []
+            for cell_lat, cell_lon, size in conn.execute(
+                    'SELECT cell_lat, cell_lon, size FROM geocode ORDER BY accessed'):
+                if excess <= 0:
+                    break
+                victims.append((cell_lat, cell_lon))
+                excess -= size
+            conn.executemany('DELETE FROM geocode WHERE cell_lat = ? AND cell_lon = ?', victims)
+            deleted += len(victims)
+        
+        self.stats['evictions'] += deleted
+    
+    def export_records(self):
+        """Yield every stored location with its cell centre coordinates"""
+        with self.lock:
+            rows = self._connect().execute('SELECT cell_lat, cell_lon, data, created FROM geocode').fetchall()
+        for cell_lat, cell_lon, data, created in rows:
+            yield {'lat': cell_lat / self.scale, 'lon': cell_lon / self.scale,
+                   'location': json.loads(data), 'created': created}
+    
+    def import_records(self, records):
+        """Bulk-load records shaped like export_records() output"""
+        return self.put_many(
+            (float(record['lat']), float(record['lon']), record['location'], record.get('created'))
+            for record in records
+        )
+    
+    def report(self):
+        stats = dict(self.stats)
+        lookups = stats['hits'] + stats['neighbour_hits'] + stats['misses']
+        stats['hit_ratio'] = round((stats['hits'] + stats['neighbour_hits']) / lookups, 3) if lookups else 0
+        try:
+            with self.lock:
+                stats['entries'], stats['bytes'] = self._connect().execute(
+                    'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM geocode').fetchone()
+        except sqlite3.Error as e:
+            stats['error'] = str(e)
+        return stats
+
+geocode_store = GeocodeStore(
+    os.getenv('GEOCODE_STORE_PATH', os.path.join(STATE_DIR, 'geocode.sqlite3')),
+    ttl=int(os.getenv('GEOCODE_STORE_TTL_DAYS', 30)) * 86400,
+    max_bytes=int(os.getenv('GEOCODE_STORE_MAX_MB', 50)) * 1024 * 1024,
+)
+
+# =========== OFFLINE REVERSE GEOCODING ===========
+# google: every new point goes to Google (previous behaviour)
+# hybrid: answer from the local dataset; only coarse answers ("Near <town>",
+#         beyond the place's radius) are enriched with Google in the background,
+#         and points outside the dataset go to Google directly
+# offline: local dataset only
+GEOCODE_MODE = os.getenv('GEOCODE_MODE', 'hybrid').lower()
+
+class OfflineGeocoder:
+    """
+    Nearest named place from a bundled CSV of SA towns and suburbs. Points are
+    projected onto a flat km grid around the country's mid latitude and held in
+    a KD-tree, so a lookup is a handful of comparisons and never leaves the
+    process. Suburbs only claim points within a few km; anything further from
+    the nearest place than `max_km` is considered outside the dataset.
+    """
+    
+    KM_PER_DEGREE = 111.2
+    RADIUS_KM = {'suburb': 6, 'town': 25, 'city': 25}
+    
+    def __init__(self, path, max_km=150, reference_lat=-29.0):
+        self.path = path
+        self.max_km = max_km
+        self.x_scale = self.KM_PER_DEGREE * math.cos(math.radians(reference_lat))
+        self.places = None
+        self.points = None
+        self.tree = None
+        self.lock = threading.Lock()
+        self.lookups = 0
+    
+    def project(self, lat, lon):
+        return lon * self.x_scale, lat * self.KM_PER_DEGREE
+    
+    def load(self):
+        """Read the places file and build the tree (once, on first lookup)"""
+        with self.lock:
+            if self.places is not None:
+                return
+            places, points = [], []
+            try:
+                with open(self.path, newline='', encoding='utf-8') as f:
+                    for row in csv.DictReader(f):
+                        points.append(self.project(float(row['lat']), float(row['lon'])))
+                        places.append((row['name'], row['kind'], row['municipality'], row['province']))
+            except (OSError, ValueError, KeyError) as e:
+                logger.error(f"Offline geocoder could not load {self.path}: {str(e)}")
+                places, points = [], []
+            
+            self.places = places
+            self.points = points
+            self.tree = self._build(list(range(len(points))), points, 0)
+            logger.info(f"Offline geocoder loaded {len(places)} places")
+    
+    def _build(self, indexes, points, axis):
+        # Node layout: (place index, split axis, left subtree, right subtree)
+        if not indexes:
+            return None
+        indexes.sort(key=lambda i: points[i][axis])
+        middle = len(indexes) // 2
+        return (indexes[middle], axis,
+                self._build(indexes[:middle], points, 1 - axis),
+                self._build(indexes[middle + 1:], points, 1 - axis))
+    
+    def nearest(self, lat, lon):
+        """Return (place index, distance in km) of the closest place, or (None, inf)"""
+        if self.places is None:
+            self.load()
+        target = self.project(lat, lon)
+        points = self.points
+        best = [None, float('inf')]
+        
+        def search(node):
+            if node is None:
+                return
+            index, axis, left, right = node
+            point = points[index]
+            distance = (point[0] - target[0]) ** 2 + (point[1] - target[1]) ** 2
+            if distance < best[1]:
+                best[0], best[1] = index, distance
+            delta = target[axis] - point[axis]
+            near, far = (left, right) if delta < 0 else (right, left)
+            search(near)
+            if delta * delta < best[1]:
+                search(far)
+        
+        search(self.tree)
+        return best[0], math.sqrt(best[1])
+    
+    def reverse_geocode(self, lat, lon):
+        """Location dict shaped like LocationService results, or None outside the dataset"""
+        self.lookups += 1
+        index, distance = self.nearest(lat, lon)
+        if index is None or distance > self.max_km:
+            return None
+        
+        name, kind, municipality, province = self.places[index]
+        if distance <= self.RADIUS_KM.get(kind, 10):
+            display_name = name
+            accuracy = 'sublocality' if kind == 'suburb' else 'locality'
+        else:
+            display_name = f"Near {name}"
+            accuracy = 'region'
+        
+        return {
+            'name': display_name,
+            'formatted_address': ', '.join(dict.fromkeys((name, municipality, province))),
+            'latitude': lat,
+            'longitude': lon,
+            'success': True,
+            'accuracy': accuracy,
+            'distance_km': round(distance, 1),
+            'source': 'offline'
+        }
+    
+    def report(self):
+        return {
+            'places': len(self.places) if self.places is not None else None,
+            'lookups': self.lookups,
+        }
+
+offline_geocoder = OfflineGeocoder(
+    os.getenv('GEOCODE_PLACES_PATH', os.path.join(app.root_path, 'data', 'sa_places.csv')),
+    max_km=float(os.getenv('GEOCODE_OFFLINE_MAX_KM', 150)),
+)
+geocode_enrich_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix='geocode-enrich')
+geocode_enrich_pending = set()
+geocode_enrich_lock = threading.Lock()
+
+# =========== LOCATION SERVICE ===========
+class LocationService:
+    
+    @staticmethod
+    def reverse_geocode(lat: float, lon: float):
+        cache_key = f"reverse_{lat:.6f}_{lon:.6f}"
+        cached = cache.get(cache_key, 86400)
+        if cached:
+            return cached
+        
+        # Paid lookups are kept for weeks in the shared store
+        try:
+            stored = geocode_store.get(lat, lon)
+        except sqlite3.Error as e:
+            logger.error(f"Geocode store read error: {str(e)}")
+            stored = None
+        if stored:
+            location_data = dict(stored, latitude=lat, longitude=lon)
+            cache.set(cache_key, location_data, ttl=86400)
+            return location_data
+        
+        if GEOCODE_MODE != 'google':
+            location_data = offline_geocoder.reverse_geocode(lat, lon)
+            if location_data:
+                coarse = location_data['accuracy'] == 'region'
+                if coarse and GEOCODE_MODE == 'hybrid' and API_KEYS['google_maps']:
+                    # Short TTL so the street-level answer replaces it once enriched
+                    LocationService._enrich_in_background(lat, lon)
+                    cache.set(cache_key, location_data, ttl=600)
+                else:
+                    cache.set(cache_key, location_data, ttl=86400)
+                return location_data
+            if GEOCODE_MODE == 'offline':
+                return LocationService._coordinates_fallback(lat, lon)
+        
+        location_data = LocationService._google_reverse_geocode(lat, lon)
+        if location_data:
+            cache.set(cache_key, location_data, ttl=86400)
+            return location_data
+        
+        # Fallback to coordinates if geocoding fails
+        return LocationService._coordinates_fallback(lat, lon)
+    
+    @staticmethod
+    def _google_reverse_geocode(lat: float, lon: float):
+        """Street-level lookup via Google; the result is also kept in the geocode store"""
+        negative_key = f"reverse_{lat:.6f}_{lon:.6f}"
+        if cache.get_negative(negative_key):
+            return None
+        
+        failure = 'error'
+        try:
+            url = UPSTREAM_URLS['google_geocode']
+            params = {
+                'latlng': f"{lat},{lon}",
+                'key': API_KEYS['google_maps'],
+                'region': 'za',
+                'language': 'en',
+                'result_type': ['street_address', 'route', 'locality', 'sublocality', 'neighborhood']
+            }
+            
+            response = upstream.get('google/geocode', url, params=params, timeout=5, verify=False)
+            
+            if response.status_code == 200:
+                data = response.json()
+                if data['status'] == 'OK' and data['results']:
+                    # Try to get the best possible location name
+                    location_name = LocationService._extract_best_location_name(data['results'], lat, lon)
+                    
+                    location_data = {
+                        'name': location_name,
+                        'formatted_address': data['results'][0]['formatted_address'],
+                        'latitude': lat,
+                        'longitude': lon,
+                        'success': True,
+                        'accuracy': LocationService._determine_accuracy(data['results'])
+                    }
+                    
+                    try:
+                        geocode_store.put(lat, lon, location_data)
+                    except sqlite3.Error as e:
+                        logger.error(f"Geocode store write error: {str(e)}")
+                    return location_data
+                failure = data.get('status', 'error')
+            else:
+                failure = f"status {response.status_code}"
+        
+        except Exception as e:
+            logger.error(f"Reverse geocoding error: {str(e)}", extra={'cache_key': negative_key, 'upstream': 'google/geocode'})
+        
+        # ZERO_RESULTS for a point in the sea stays that way; don't ask again soon
+        cache.set_negative(negative_key, failure, NEGATIVE_TTLS['geocode'])
+        return None
+    
+    @staticmethod
+    def _enrich_in_background(lat: float, lon: float):
+        """Queue one Google lookup per store cell; later requests pick it up from the store"""
+        cell = geocode_store.cell(lat, lon)
+        with geocode_enrich_lock:
+            if cell in geocode_enrich_pending:
+                return
+            geocode_enrich_pending.add(cell)
+        
+        def enrich():
+            try:
+                location_data = LocationService._google_reverse_geocode(lat, lon)
+                if location_data:
+                    cache.set(f"reverse_{lat:.6f}_{lon:.6f}", location_data, ttl=86400)
+            finally:
+                with geocode_enrich_lock:
+                    geocode_enrich_pending.discard(cell)
+        
+        geocode_enrich_pool.submit(enrich)
+    
+    @staticmethod
+    def _coordinates_fallback(lat: float, lon: float):
+        return {
+            'name': f"Location ({lat:.4f}, {lon:.4f})",
+            'formatted_address': f"Latitude: {lat:.4f}, Longitude: {lon:.4f}",
             'latitude': lat,
             'longitude': lon,
             'success': False,
@@ -512,216 +2055,1613 @@ class LocationService:
         elif 'administrative_area_level_2' in types:
             return 'municipality'
         else:
-            return 'general'
+            return 'general'
+
+# =========== SA CITIES ===========
+# Coordinates for the cities shown on the weather pages
+SA_CITIES = {
+    'Johannesburg': (-26.2041, 28.0473),
+    'Cape Town': (-33.9249, 18.4241),
+    'Durban': (-29.8587, 31.0218),
+    'Pretoria': (-25.7479, 28.2293),
+    'Port Elizabeth': (-33.9608, 25.6022),
+    'Bloemfontein': (-29.0852, 26.1596),
+    'East London': (-33.0153, 27.9116),
+    'Polokwane': (-23.9045, 29.4689),
+    'Mbombela': (-25.4658, 30.9853),
+    'Kimberley': (-28.7282, 24.7499),
+    'Pietermaritzburg': (-29.6006, 30.3794),
+    'Rustenburg': (-25.6676, 27.2421),
+    'George': (-33.9630, 22.4617),
+}
+SA_CITY_LOOKUP = {name.lower(): name for name in SA_CITIES}
+SA_CITY_LOOKUP.update({'gqeberha': 'Port Elizabeth', 'nelspruit': 'Mbombela'})
+
+WEATHER_BATCH_MAX_LOCATIONS = 20
+
+# Coordinate-keyed weather for /api/weather and the city cards
+WEATHER_TTL = 300
+WEATHER_GRID_DECIMALS = 2
+
+# OpenWeatherMap refreshes current conditions about every 10 minutes and the
+# 3-hourly forecast a few times a day, so proxied payloads can live that long
+WEATHER_PROXY_TTLS = {
+    'current': 600,
+    'forecast': 1800,
+}
+
+# Known cities are proxied by their grid point, so each forecast fetch for one
+# of them also fills the proxy entries instead of a second upstream round trip
+SA_CITY_POINTS = {
+    (round(lat, WEATHER_GRID_DECIMALS), round(lon, WEATHER_GRID_DECIMALS)) for lat, lon in SA_CITIES.values()
+}
+
+# Cities kept warm by the weather warmer (comma separated in WEATHER_WARM_CITIES);
+# defaults to the cards on the weather pages to stay well inside the API quota
+WEATHER_WARM_CITIES = [
+    city.strip() for city in os.getenv(
+        'WEATHER_WARM_CITIES', 'Johannesburg,Cape Town,Durban,Pretoria,Port Elizabeth,Bloemfontein'
+    ).split(',')
+    if city.strip().lower() in SA_CITY_LOOKUP
+]
+
+# Upstream weather fetches for batch requests share one bounded pool
+weather_pool = ThreadPoolExecutor(max_workers=int(os.getenv('WEATHER_BATCH_WORKERS', 4)),
+                                  thread_name_prefix='weather-fetch')
+
+# =========== WEATHER SERVICE WITH HOURLY FORECAST ===========
+class WeatherService:
+    """Get weather data from OpenWeatherMap with hourly forecast"""
+    
+    @staticmethod
+    def quantize(lat, lon):
+        """Snap coordinates to a ~1km grid so nearby requests share cache entries"""
+        return round(lat, WEATHER_GRID_DECIMALS), round(lon, WEATHER_GRID_DECIMALS)
+    
+    @staticmethod
+    def _lookup(cache_key, max_age, as_json=False):
+        cached = cache.get(cache_key, max_age, encoded=as_json)
+        weather_warmer.record_lookup(cache_key, cached is not None)
+        return cached
+    
+    @staticmethod
+    def get_weather_with_forecast(lat: float, lon: float, as_json=False, force_refresh=False):
+        """Get current weather AND 5-day forecast WITH HOURLY DATA"""
+        lat, lon = WeatherService.quantize(lat, lon)
+        cache_key = f"weather_forecast_{lat}_{lon}"
+        
+        if not force_refresh:
+            cached = WeatherService._lookup(cache_key, WEATHER_TTL, as_json)
+            if cached:
+                if not as_json:
+                    cached['cached'] = True
+                return cached
+            if cache.get_negative(cache_key):
+                return None
+        
+        failure = 'error'
+        try:
+            current_url = f"{UPSTREAM_URLS['weather']}/weather"
+            current_params = {
+                'lat': lat,
+                'lon': lon,
+                'appid': API_KEYS['weather'],
+                'units': 'metric',
+                'lang': 'en'
+            }
+            
+            forecast_url = f"{UPSTREAM_URLS['weather']}/forecast"
+            forecast_params = {
+                'lat': lat,
+                'lon': lon,
+                'appid': API_KEYS['weather'],
+                'units': 'metric',
+                'lang': 'en',
+                'cnt': 40
+            }
+            
+            current_response = upstream.get('owm/weather', current_url, params=current_params, timeout=10)
+            forecast_response = upstream.get('owm/forecast', forecast_url, params=forecast_params, timeout=10)
+            
+            if current_response.status_code == 200 and forecast_response.status_code == 200:
+                current_data, forecast_data = current_response.json(), forecast_response.json()
+                weather_data = WeatherService._process_weather_payloads(current_data, forecast_data)
+                
+                cache.set(cache_key, weather_data, ttl=WEATHER_TTL)
+                # Same upstream payloads, so fill the sibling entries too
+                cache.set(f"weather_current_{lat}_{lon}",
+                          {'success': True, 'current': weather_data['current'], 'cached': False}, ttl=WEATHER_TTL)
+                if (lat, lon) in SA_CITY_POINTS:
+                    cache.set(f"weather_point_current_{lat}_{lon}", current_data, ttl=WEATHER_PROXY_TTLS['current'])
+                    cache.set(f"weather_point_forecast_{lat}_{lon}", forecast_data, ttl=WEATHER_PROXY_TTLS['forecast'])
+                return weather_data
+            failure = f"status {current_response.status_code}/{forecast_response.status_code}"
+                
+        except Exception as e:
+            logger.error(f"Weather API error: {str(e)}", extra={'cache_key': cache_key, 'upstream': 'owm'})
+        
+        cache.set_negative(cache_key, failure, NEGATIVE_TTLS['weather'])
+        return None
+    
+    @staticmethod
+    def _process_weather_payloads(current_data, forecast_data):
+        """Build the /api/weather body from the OWM current and forecast payloads"""
+        # Process current weather
+        current_weather = WeatherService._process_current_weather(current_data)
+        
+        # Process hourly forecast
+        hourly_forecast = []
+        
+        slot_times = sast_strings_bulk([item['dt'] for item in forecast_data['list']])
+        
+        for item, slot_time in zip(forecast_data['list'][:12], slot_times):
+            hourly_forecast.append(HourlyForecast(
+                time=slot_time.hour,
+                temp=round(item['main']['temp']),
+                feels_like=round(item['main']['feels_like']),
+                description=item['weather'][0]['description'].title(),
+                icon=item['weather'][0]['icon'],
+                humidity=item['main']['humidity'],
+                wind_speed=round(item['wind']['speed'] * 3.6, 1),
+                pop=round(item.get('pop', 0) * 100),
+                clouds=item.get('clouds', {}).get('all', 0),
+            ))
+        
+        # Process 5-day forecast
+        forecast_days = WeatherService.aggregate_daily_forecasts([forecast_data['list']])[0]
+        
+        weather_data = {
+            'success': True,
+            'current': current_weather,
+            'hourly': hourly_forecast[:8],
+            'forecast': forecast_days[:5],
+            'cached': False
+        }
+        return weather_data
+    
+    @staticmethod
+    def _process_current_weather(current_data):
+        return {
+            'temp': round(current_data['main']['temp']),
+            'feels_like': round(current_data['main']['feels_like']),
+            'humidity': current_data['main']['humidity'],
+            'pressure': current_data['main']['pressure'],
+            'wind_speed': round(current_data['wind']['speed'] * 3.6, 1),
+            'wind_deg': current_data['wind'].get('deg', 0),
+            'description': current_data['weather'][0]['description'].title(),
+            'icon': current_data['weather'][0]['icon'],
+            'visibility': current_data.get('visibility', 10000) / 1000,
+            'clouds': current_data.get('clouds', {}).get('all', 0),
+            'sunrise': sast_strings(current_data['sys']['sunrise']).time,
+            'sunset': sast_strings(current_data['sys']['sunset']).time,
+            'timestamp': datetime.now().isoformat(),
+        }
+    
+    @staticmethod
+    def get_current_weather(lat: float, lon: float, force_refresh=False):
+        """Get current conditions only, for lightweight city summaries"""
+        lat, lon = WeatherService.quantize(lat, lon)
+        cache_key = f"weather_current_{lat}_{lon}"
+        
+        if not force_refresh:
+            cached = WeatherService._lookup(cache_key, WEATHER_TTL)
+            if cached:
+                return dict(cached, cached=True)
+            if cache.get_negative(cache_key):
+                return None
+        
+        failure = 'error'
+        try:
+            url = f"{UPSTREAM_URLS['weather']}/weather"
+            params = {
+                'lat': lat,
+                'lon': lon,
+                'appid': API_KEYS['weather'],
+                'units': 'metric',
+                'lang': 'en'
+            }
+            
+            response = upstream.get('owm/weather', url, params=params, timeout=10)
+            
+            if response.status_code == 200:
+                weather_data = {
+                    'success': True,
+                    'current': WeatherService._process_current_weather(response.json()),
+                    'cached': False
+                }
+                cache.set(cache_key, weather_data, ttl=WEATHER_TTL)
+                return weather_data
+            failure = f"status {response.status_code}"
+        
+        except Exception as e:
+            logger.error(f"Current weather API error: {str(e)}", extra={'cache_key': cache_key, 'upstream': 'owm/weather'})
+        
+        cache.set_negative(cache_key, failure, NEGATIVE_TTLS['weather'])
+        return None
+    
+    @staticmethod
+    def sibling_keys(lat, lon):
+        """Entries get_weather_with_forecast fills alongside weather_forecast for a grid point"""
+        keys = [f"weather_current_{lat}_{lon}"]
+        if (lat, lon) in SA_CITY_POINTS:
+            keys += [f"weather_point_{kind}_{lat}_{lon}" for kind in WEATHER_PROXY_TTLS]
+        return keys
+    
+    @staticmethod
+    def _city_query(kind, city=None, lat=None, lon=None):
+        """Return the upstream query and cache key for a proxied city or point"""
+        if city is not None:
+            name = SA_CITY_LOOKUP.get(city.lower())
+            if not name:
+                return {'q': f"{city},ZA"}, f"weather_city_{kind}_{city.lower()}"
+            # Known cities share their grid point's entries, which the warmer keeps filled
+            lat, lon = SA_CITIES[name]
+        
+        lat, lon = WeatherService.quantize(lat, lon)
+        return {'lat': lat, 'lon': lon}, f"weather_point_{kind}_{lat}_{lon}"
+    
+    @staticmethod
+    def get_city_weather(kind, city=None, lat=None, lon=None, as_json=False, force_refresh=False):
+        """
+        Proxy OpenWeatherMap current weather or forecast for a city name or a
+        point, shared by every visitor through the cache. Known SA cities are
+        looked up by their grid point; other names use OpenWeatherMap's search.
+        """
+        endpoint = 'weather' if kind == 'current' else 'forecast'
+        query, cache_key = WeatherService._city_query(kind, city, lat, lon)
+        
+        if not force_refresh:
+            cached = WeatherService._lookup(cache_key, WEATHER_PROXY_TTLS[kind], as_json)
+            if cached:
+                return cached
+            failure = cache.get_negative(cache_key)
+            if failure == 'not_found':
+                return {'success': False, 'error': 'City not found'}
+            elif failure:
+                return None
+        
+        failure = 'error'
+        try:
+            params = dict(query, appid=API_KEYS['weather'], units='metric', lang='en')
+            response = upstream.get(f"owm/{endpoint}", f"{UPSTREAM_URLS['weather']}/{endpoint}",
+                                    params=params, timeout=10)
+            
+            if response.status_code == 200:
+                weather_data = response.json()
+                cache.set(cache_key, weather_data, ttl=WEATHER_PROXY_TTLS[kind])
+                return weather_data
+            elif response.status_code == 404:
+                # Unknown names are typos and stay unknown; remember them longer
+                cache.set_negative(cache_key, 'not_found', NEGATIVE_TTLS['weather'] * 5)
+                return {'success': False, 'error': 'City not found'}
+            else:
+                logger.error(f"Weather proxy error {response.status_code} for {cache_key}",
+                             extra={'cache_key': cache_key, 'upstream': f"owm/{endpoint}", 'status': response.status_code})
+                failure = f"status {response.status_code}"
+        
+        except Exception as e:
+            logger.error(f"Weather proxy error: {str(e)}", extra={'cache_key': cache_key, 'upstream': f"owm/{endpoint}"})
+        
+        cache.set_negative(cache_key, failure, NEGATIVE_TTLS['weather'])
+        return None
+    
+    @staticmethod
+    def get_weather_batch(locations, include_forecast=False):
+        """
+        Weather for several locations in one call. Cache hits are resolved in a
+        single pass; only the misses go upstream, concurrently on the shared
+        bounded pool.
+        """
+        if include_forecast:
+            fetch, key_prefix = WeatherService.get_weather_with_forecast, 'weather_forecast'
+        else:
+            fetch, key_prefix = WeatherService.get_current_weather, 'weather_current'
+        
+        results = [None] * len(locations)
+        misses = []
+        for i, location in enumerate(locations):
+            lat, lon = WeatherService.quantize(location['lat'], location['lon'])
+            cached = WeatherService._lookup(f"{key_prefix}_{lat}_{lon}", WEATHER_TTL)
+            if cached:
+                results[i] = dict(cached, cached=True)
+            else:
+                misses.append(i)
+        
+        if misses:
+            fetched = weather_pool.map(
+                lambda i: fetch(locations[i]['lat'], locations[i]['lon']),
+                misses
+            )
+            for i, weather_data in zip(misses, fetched):
+                results[i] = weather_data
+        
+        combined = []
+        for location, weather_data in zip(locations, results):
+            entry = {
+                'name': location['name'],
+                'coordinates': {'lat': location['lat'], 'lon': location['lon']},
+            }
+            if weather_data:
+                entry.update(weather_data)
+            else:
+                entry.update({'success': False, 'error': 'Weather temporarily unavailable'})
+            combined.append(entry)
+        
+        return {
+            'success': True,
+            'locations': combined,
+            'total': len(combined),
+            'cache_hits': len(locations) - len(misses),
+            'upstream_fetches': len(misses),
+            'timestamp': datetime.now().isoformat(),
+        }
+    
+    @staticmethod
+    def _forecast_columns(items):
+        """Split one location's forecast slots into parallel columns"""
+        weather = [item['weather'][0] for item in items]
+        return {
+            'timestamp': [item['dt'] for item in items],
+            # Whole SAST days since the epoch
+            'day': [(item['dt'] + SAST_OFFSET) // 86400 for item in items],
+            'temp': [item['main']['temp'] for item in items],
+            'icon': [w['icon'] for w in weather],
+            'description': [w['description'] for w in weather],
+            'pop': [item.get('pop', 0) for item in items],
+        }
+    
+    @staticmethod
+    def _most_common(values):
+        # A day has at most 8 slots, so counting in C beats building a tally;
+        # ties go to the earliest slot as before
+        return max(values, key=values.count)
+    
+    @staticmethod
+    def aggregate_daily_forecasts(forecast_lists, days=5):
+        """
+        Aggregate 3-hourly forecast slots into daily summaries for each location.
+        Slots arrive in time order, so every day is a contiguous run of the
+        columns, found by bisection and reduced with builtins over slices.
+        """
+        today = (int(time.time()) + SAST_OFFSET) // 86400
+        forecasts = []
+        
+        for items in forecast_lists:
+            columns = WeatherService._forecast_columns(items)
+            day_column = columns['day']
+            daily = []
+            
+            start = 0
+            total = len(day_column)
+            while start < total and len(daily) < days:
+                day = day_column[start]
+                end = bisect_right(day_column, day, start)
+                
+                if day > today:
+                    temps = columns['temp'][start:end]
+                    slot_time = sast_strings(columns['timestamp'][start])
+                    daily.append(DailyForecast(
+                        date=slot_time.date,
+                        day=slot_time.day,
+                        month_day=slot_time.month_day,
+                        temp=round(sum(temps) / len(temps)),
+                        temp_min=round(min(temps)),
+                        temp_max=round(max(temps)),
+                        icon=WeatherService._most_common(columns['icon'][start:end]),
+                        description=WeatherService._most_common(columns['description'][start:end]).title(),
+                        pop=round(max(columns['pop'][start:end]) * 100),
+                    ))
+                start = end
+            
+            forecasts.append(daily)
+        
+        return forecasts
+
+# =========== WEATHER CACHE WARMER ===========
+class WeatherWarmer:
+    """
+    Keep weather for major cities and the most requested points warm so the
+    first visitors after a deploy or cache expiry never wait on upstream.
+    Refreshes are spread evenly across each cycle instead of bursting.
+    """
+    
+    def __init__(self, cities, top_points=10, cycle=WEATHER_TTL * 0.8, startup_spacing=1):
+        self.cities = [SA_CITY_LOOKUP[city.lower()] for city in cities]
+        self.top_points = top_points
+        self.cycle = cycle
+        self.startup_spacing = startup_spacing
+        self.point_counts = {}
+        self.warmed_keys = set()
+        self.lock = threading.Lock()
+        self.thread = None
+        self.stats = {
+            'lookups': 0,
+            'hits': 0,
+            'warm_hits': 0,
+            'misses': 0,
+            'refreshes': 0,
+            'refresh_failures': 0,
+        }
+    
+    def record_point(self, lat, lon):
+        """Count a request for a point so popular ones get warmed"""
+        point = WeatherService.quantize(lat, lon)
+        with self.lock:
+            self.point_counts[point] = self.point_counts.get(point, 0) + 1
+    
+    def record_lookup(self, cache_key, hit):
+        stats = self.stats
+        stats['lookups'] += 1
+        if hit:
+            stats['hits'] += 1
+            if cache_key in self.warmed_keys:
+                stats['warm_hits'] += 1
+        else:
+            stats['misses'] += 1
+    
+    def popular_points(self):
+        with self.lock:
+            ranked = sorted(self.point_counts.items(), key=lambda item: item[1], reverse=True)
+        city_points = {WeatherService.quantize(*SA_CITIES[city]) for city in self.cities}
+        return [point for point, _ in ranked if point not in city_points][:self.top_points]
+    
+    def jobs(self):
+        """
+        Return (cache_key, max_age, refresh, filled_keys) for everything that
+        should stay warm. One forecast fetch per point also fills its current
+        conditions and, for cities, the proxy entries (filled_keys).
+        """
+        points = [WeatherService.quantize(*SA_CITIES[city]) for city in self.cities] + self.popular_points()
+        return [
+            (f"weather_forecast_{lat}_{lon}", WEATHER_TTL,
+             lambda lat=lat, lon=lon: WeatherService.get_weather_with_forecast(lat, lon, force_refresh=True),
+             WeatherService.sibling_keys(lat, lon))
+            for lat, lon in points
+        ]
+    
+    def warm(self, cache_key, max_age, refresh, filled_keys=()):
+        """Refresh an entry that would otherwise expire before the next cycle"""
+        age = cache.age(cache_key)
+        if age is not None and age + self.cycle < max_age:
+            return False
+        
+        self.stats['refreshes'] += 1
+        if refresh():
+            self.warmed_keys.add(cache_key)
+            self.warmed_keys.update(filled_keys)
+            return True
+        self.stats['refresh_failures'] += 1
+        return False
+    
+    def start(self):
+        if self.thread is None or not self.thread.is_alive():
+            self.thread = threading.Thread(target=self._run, name='weather-warmer', daemon=True)
+            self.thread.start()
+    
+    def _run(self):
+        first_pass = True
+        while True:
+            started = time.time()
+            jobs = self.jobs()
+            spacing = self.startup_spacing if first_pass else self.cycle / max(len(jobs), 1)
+            
+            for cache_key, max_age, refresh, filled_keys in jobs:
+                try:
+                    if self.warm(cache_key, max_age, refresh, filled_keys) or not first_pass:
+                        time.sleep(spacing)
+                except Exception as e:
+                    logger.error(f"Weather warmer error for {cache_key}: {str(e)}", extra={'cache_key': cache_key})
+            
+            # Let old traffic fade so the warm set follows current demand
+            with self.lock:
+                self.point_counts = {point: count / 2 for point, count in self.point_counts.items() if count >= 1}
+            
+            first_pass = False
+            time.sleep(max(0, self.cycle - (time.time() - started)))
+    
+    def report(self):
+        stats = dict(self.stats)
+        lookups = stats['lookups'] or 1
+        stats['hit_ratio'] = round(stats['hits'] / lookups, 3)
+        stats['warm_hit_ratio'] = round(stats['warm_hits'] / lookups, 3)
+        stats['warm_keys'] = len(self.warmed_keys)
+        stats['tracked_points'] = len(self.point_counts)
+        stats['cities'] = self.cities
+        return stats
+
+weather_warmer = WeatherWarmer(WEATHER_WARM_CITIES, top_points=int(os.getenv('WEATHER_WARM_TOP_POINTS', 10)))
+
+# =========== LIVE SCORE STREAM ===========
+class LiveScoreBroadcaster:
+    """Fan out live score changes from one refresh loop to all SSE subscribers"""
+    
+    def __init__(self, interval=30, heartbeat=15, max_subscribers=800, max_stream_age=1800):
+        self.interval = interval
+        self.heartbeat = heartbeat
+        self.max_subscribers = max_subscribers
+        self.max_stream_age = max_stream_age
+        self.subscribers = set()
+        self.lock = threading.Lock()
+        self.thread = None
+        self.scores = {}
+        self.latest_event = None
+        self.version = 0
+    
+    def subscribe(self):
+        """Register a subscriber queue, or return None when at capacity"""
+        with self.lock:
+            if len(self.subscribers) >= self.max_subscribers:
+                return None
+            
+            subscriber = queue.Queue(maxsize=5)
+            self.subscribers.add(subscriber)
+            
+            # The refresh loop only runs while somebody is listening
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(target=self._run, name='live-score-refresh', daemon=True)
+                self.thread.start()
+        
+        return subscriber
+    
+    def unsubscribe(self, subscriber):
+        with self.lock:
+            self.subscribers.discard(subscriber)
+    
+    def _run(self):
+        while True:
+            with self.lock:
+                if not self.subscribers:
+                    self.thread = None
+                    return
+            
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.error(f"Live stream refresh error: {str(e)}")
+            
+            time.sleep(self.interval)
+    
+    def refresh(self):
+        """Poll live matches once and broadcast if any score changed"""
+        live_data = FootballDataService.get_live_matches()
+        matches = live_data.get('matches', [])
+        
+        scores = {
+            match['id']: (match['score'], match['status'], match.get('minute'))
+            for match in matches
+        }
+        changed = [match_id for match_id, score in scores.items() if self.scores.get(match_id) != score]
+        finished = [match_id for match_id in self.scores if match_id not in scores]
+        
+        if not changed and not finished and self.latest_event is not None:
+            return
+        
+        self.scores = scores
+        self.version += 1
+        self.latest_event = self._format_event('scores', {
+            'success': True,
+            'version': self.version,
+            'matches': matches,
+            'changed': changed,
+            'finished': finished,
+            'total': len(matches),
+            'last_updated': live_data.get('last_updated'),
+        })
+        self._publish(self.latest_event)
+    
+    def _publish(self, event):
+        with self.lock:
+            subscribers = list(self.subscribers)
+        
+        for subscriber in subscribers:
+            try:
+                subscriber.put_nowait(event)
+            except queue.Full:
+                # Every event carries the full scoreboard, so a slow client
+                # only needs the newest one
+                try:
+                    while True:
+                        subscriber.get_nowait()
+                except queue.Empty:
+                    pass
+                subscriber.put_nowait(event)
+    
+    def _format_event(self, event_name, payload):
+        return f"event: {event_name}\nid: {self.version}\ndata: {encode_json(payload).decode('utf-8')}\n\n"
+    
+    def stream(self, subscriber):
+        """Yield SSE frames for one subscriber until it disconnects or expires"""
+        started = time.time()
+        try:
+            yield f"retry: {int(self.interval * 1000)}\n\n"
+            if self.latest_event:
+                yield self.latest_event
+            
+            # Streams are recycled periodically; EventSource reconnects by itself
+            while time.time() - started < self.max_stream_age:
+                try:
+                    yield subscriber.get(timeout=self.heartbeat)
+                except queue.Empty:
+                    yield ": keep-alive\n\n"
+        finally:
+            self.unsubscribe(subscriber)
+
+# Each open stream holds one of the gevent worker's connections (see
+# gunicorn.conf.py); keep a fifth of them free for pages, the polling
+# fallback and the 503 that tells clients to switch to it
+WORKER_CONNECTIONS = int(os.getenv('WORKER_CONNECTIONS', 1000))
+
+live_broadcaster = LiveScoreBroadcaster(
+    interval=int(os.getenv('LIVE_STREAM_INTERVAL', 30)),
+    max_subscribers=min(int(os.getenv('LIVE_STREAM_MAX_SUBSCRIBERS', WORKER_CONNECTIONS * 0.8)),
+                        int(WORKER_CONNECTIONS * 0.8)),
+)
+
+# =========== STANDINGS SCHEDULER ===========
+class StandingsScheduler:
+    """
+    Refresh each competition's standings shortly after its matches finish,
+    plus once per period at its own offset. Also keeps today's fixtures (and
+    with them the match schedule) current.
+    """
+    
+    def __init__(self, competitions, period=3600, warmup_spacing=10, tick=60):
+        self.competitions = list(competitions)
+        self.period = period
+        self.warmup_spacing = warmup_spacing
+        # Spread upstream calls evenly across the period instead of bursting
+        slot = period / max(len(self.competitions), 1)
+        self.offsets = {code: i * slot for i, code in enumerate(self.competitions)}
+        self.tick = tick
+        self.last_refreshed = {}
+        self.whistle_refreshes = 0
+        self.thread = None
+    
+    def next_due(self, now):
+        """Return (timestamp, competition) of the next scheduled refresh"""
+        period_start = now - now % self.period
+        due = []
+        for code, offset in self.offsets.items():
+            run_at = period_start + offset
+            if run_at <= now:
+                run_at += self.period
+            due.append((run_at, code))
+        return min(due)
+    
+    def start(self):
+        if self.thread is None or not self.thread.is_alive():
+            self.thread = threading.Thread(target=self._run, name='standings-scheduler', daemon=True)
+            self.thread.start()
+    
+    def _run(self):
+        # Fill anything missing after boot, still spaced out to respect rate limits
+        for code in self.competitions:
+            if cache.get(f"football_standings_{code}", STANDINGS_MAX_AGE) is None:
+                self._refresh(code)
+                time.sleep(self.warmup_spacing)
+        
+        run_at, code = self.next_due(time.time())
+        while True:
+            now = time.time()
+            
+            if not match_schedule.known(now):
+                try:
+                    FootballDataService.get_todays_matches()
+                except Exception as e:
+                    logger.error(f"Scheduled fixtures refresh error: {str(e)}")
+            
+            for due in match_schedule.standings_due(now):
+                if due in self.offsets:
+                    self._refresh(due)
+                    self.whistle_refreshes += 1
+            
+            if now >= run_at:
+                self._refresh(code)
+                run_at, code = self.next_due(time.time())
+            
+            time.sleep(max(1, min(run_at - time.time(), self.tick)))
+    
+    def _refresh(self, code):
+        try:
+            FootballDataService.get_standings(code, force_refresh=True)
+            self.last_refreshed[code] = time.time()
+        except Exception as e:
+            logger.error(f"Scheduled standings refresh error ({code}): {str(e)}")
+
+standings_scheduler = StandingsScheduler(FOOTBALL_COMPETITIONS, period=STANDINGS_REFRESH_PERIOD)
+
+# =========== PAGE FRAGMENTS ===========
+class PageFragments:
+    """
+    Rendered template output keyed by (name, version). A fragment is rendered
+    once per version; asking for a newer version replaces the older one, so
+    callers key on whatever their inputs change with (a date, a cache entry's
+    timestamp) and concatenate fragments into the final page.
+    """
+    
+    def __init__(self):
+        self.rendered = {}
+        self.lock = threading.Lock()
+        self.renders = 0
+        self.hits = 0
+    
+    def render(self, name, version, render):
+        entry = self.rendered.get(name)
+        if entry is not None and entry[0] == version:
+            self.hits += 1
+            return entry[1]
+        
+        html = render()
+        with self.lock:
+            self.rendered[name] = (version, html)
+            self.renders += 1
+        return html
+    
+    def report(self):
+        return {'fragments': len(self.rendered), 'renders': self.renders, 'hits': self.hits}
+
+page_fragments = PageFragments()
+
+HOMEPAGE_GUIDES = [
+    {
+        'title': 'How to Check SASSA Status Online',
+        'description': 'Step-by-step guide for South Africans to check their SASSA grant status online.',
+        'url': '/article/sassa-status-check',
+        'image': 'sassa-status.jpg',
+        'category': 'SASSA'
+    },
+    {
+        'title': 'How to Make Money Online in South Africa',
+        'description': 'Legitimate ways to earn money online from South Africa in 2026.',
+        'url': '/article/make-money-online-sa',
+        'image': 'make-money.jpg',
+        'category': 'Finance'
+    },
+    {
+        'title': 'How to Write a CV in South Africa',
+        'description': 'Create a professional CV that stands out to South African employers.',
+        'url': '/article/how-to-write-cv-sa',
+        'image': 'cv-writing.jpg',
+        'category': 'Career'
+    },
+    {
+        'title': 'Best Job Websites in South Africa',
+        'description': 'Top platforms to find employment opportunities in South Africa.',
+        'url': '/article/best-job-websites-sa',
+        'image': 'job-websites.jpg',
+        'category': 'Career'
+    },
+    {
+        'title': 'How Students Can Make Money Online',
+        'description': 'Practical online income opportunities for South African students.',
+        'url': '/article/students-make-money-online',
+        'image': 'students-money.jpg',
+        'category': 'Finance'
+    },
+    {
+        'title': 'How to Start an Online Business in South Africa',
+        'description': 'Complete guide to launching your online business in South Africa.',
+        'url': '/article/start-online-business-sa',
+        'image': 'online-business.jpg',
+        'category': 'Business'
+    }
+]
+
+# =========== SASSA PAYMENT CALENDAR ===========
+class SassaCalendar:
+    """
+    Multi-year SASSA payment dates per grant type, loaded from the shipped JSON
+    data file plus an admin overlay under STATE_DIR, into sorted date lists so
+    the next payment is a bisect away. Admin edits only ever write the overlay,
+    so the code checkout stays read-only and edits survive deploys. Both files
+    are re-read when either changes on disk (an admin edit in any worker, or a
+    deploy), and the ICS export is rendered once per loaded version.
+    """
+    
+    RELOAD_CHECK_INTERVAL = 5
+    
+    def __init__(self, path, overlay_path):
+        self.path = path
+        self.overlay_path = overlay_path
+        self.lock = threading.Lock()
+        self.grants = {}
+        self.note = None
+        self.entries = []
+        self.dates = []
+        self.by_grant = {}
+        self.version = 0
+        self.digest = None
+        self.mtime = None
+        self.checked = 0
+        self.ics = None
+    
+    def file_mtimes(self):
+        """(data file, overlay) modification times; the overlay's is None until first saved"""
+        try:
+            overlay_mtime = os.path.getmtime(self.overlay_path)
+        except FileNotFoundError:
+            overlay_mtime = None
+        return os.path.getmtime(self.path), overlay_mtime
+    
+    def read_overlay(self):
+        """Raw bytes and parsed overlay document, or (b'', None) when there is none"""
+        try:
+            with open(self.overlay_path, 'rb') as f:
+                raw = f.read()
+        except FileNotFoundError:
+            return b'', None
+        return raw, json.loads(raw)
+    
+    def load(self):
+        """(Re)build the index from both files; keeps the old one if either is bad"""
+        try:
+            mtime = self.file_mtimes()
+            with open(self.path, 'rb') as f:
+                raw = f.read()
+            document = json.loads(raw)
+            overlay_raw, overlay = self.read_overlay()
+            
+            # Overlay entries win per (date, grant); a replace overlay hides the shipped dates
+            merged = {}
+            if not (overlay and overlay.get('replace')):
+                for entry in document.get('dates', []):
+                    merged[(entry['date'], entry.get('grant', 'all'))] = entry
+            for entry in (overlay or {}).get('dates', []):
+                merged[(entry['date'], entry.get('grant', 'all'))] = entry
+            
+            entries = sorted(
+                (datetime.strptime(entry['date'], '%Y-%m-%d').date(), entry.get('grant', 'all'),
+                 bool(entry.get('provisional')))
+                for entry in merged.values()
+            )
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+            logger.error(f"SASSA calendar load error ({self.path}, {self.overlay_path}): {str(e)}")
+            return False
+        
+        by_grant = {}
+        for payment_date, grant, provisional in entries:
+            by_grant.setdefault(grant, []).append(payment_date)
+        
+        with self.lock:
+            self.grants = document.get('grants', {})
+            self.note = document.get('note')
+            self.entries = entries
+            self.dates = [entry[0] for entry in entries]
+            self.by_grant = by_grant
+            self.mtime = mtime
+            self.ics = None
+            self.version += 1
+            # Content-derived, so cached responses survive restarts only while still valid
+            self.digest = hashlib.sha1(raw + b'\0' + overlay_raw).hexdigest()[:12]
+        logger.info(f"SASSA calendar loaded {len(entries)} dates (version {self.version})")
+        return True
+    
+    def maybe_reload(self):
+        now = time.time()
+        if now - self.checked < self.RELOAD_CHECK_INTERVAL:
+            return
+        self.checked = now
+        try:
+            if self.file_mtimes() != self.mtime:
+                self.load()
+        except OSError:
+            pass
+    
+    def next_payment(self, today, grant=None):
+        """Earliest (date, grant, provisional) on or after today, or None past the end"""
+        if grant:
+            dates = self.by_grant.get(grant, [])
+            index = bisect_left(dates, today)
+            if index == len(dates):
+                return None
+            return self.entries[bisect_left(self.entries, (dates[index], grant))]
+        index = bisect_left(self.dates, today)
+        return self.entries[index] if index < len(self.entries) else None
+    
+    def upcoming(self, today, limit=6):
+        index = bisect_left(self.dates, today)
+        return self.entries[index:index + limit]
+    
+    def save(self, entries, replace=False):
+        """
+        Write dates to the overlay and reload; entries are (date, grant, provisional).
+        With replace, the overlay's dates stand in for the shipped ones entirely.
+        """
+        overlay = None if replace else self.read_overlay()[1]
+        overlay = overlay or {'replace': replace, 'dates': []}
+        
+        existing = {(entry['date'], entry.get('grant', 'all')): entry for entry in overlay['dates']}
+        for payment_date, grant, provisional in entries:
+            entry = {'date': payment_date.isoformat(), 'grant': grant}
+            if provisional:
+                entry['provisional'] = True
+            existing[(entry['date'], grant)] = entry
+        
+        overlay['dates'] = sorted(existing.values(), key=lambda entry: (entry['date'], entry['grant']))
+        overlay['updated'] = datetime.now(sa_timezone).date().isoformat()
+        
+        os.makedirs(os.path.dirname(self.overlay_path), exist_ok=True)
+        tmp_path = f"{self.overlay_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(overlay, f, indent=2)
+            f.write('\n')
+        os.replace(tmp_path, self.overlay_path)
+        return self.load()
+    
+    def grant_name(self, grant):
+        return self.grants.get(grant, grant.replace('_', ' ').title())
+    
+    def to_ics(self):
+        """iCalendar export of every date, rendered once per calendar version"""
+        ics = self.ics
+        if ics is not None:
+            return ics
+        
+        stamp = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+        lines = [
+            'BEGIN:VCALENDAR',
+            'VERSION:2.0',
+            'PRODID:-//SA Daily Portal//SASSA Payment Dates//EN',
+            'CALSCALE:GREGORIAN',
+            'X-WR-CALNAME:SASSA Payment Dates',
+            'X-WR-TIMEZONE:Africa/Johannesburg',
+        ]
+        for payment_date, grant, provisional in self.entries:
+            summary = f"SASSA payment: {self.grant_name(grant)}"
+            lines += [
+                'BEGIN:VEVENT',
+                f"UID:sassa-{payment_date.isoformat()}-{grant}@saportal.site",
+                f"DTSTAMP:{stamp}",
+                f"DTSTART;VALUE=DATE:{payment_date:%Y%m%d}",
+                f"DTEND;VALUE=DATE:{payment_date + timedelta(days=1):%Y%m%d}",
+                f"SUMMARY:{summary}{' (provisional)' if provisional else ''}",
+                'TRANSP:TRANSPARENT',
+                'END:VEVENT',
+            ]
+        lines.append('END:VCALENDAR')
+        self.ics = ics = '\r\n'.join(lines) + '\r\n'
+        return ics
+
+def format_payment_date(payment_date):
+    return f"{payment_date.day} {payment_date:%B %Y}"
+
+sassa_calendar = SassaCalendar(
+    os.getenv('SASSA_DATES_PATH', os.path.join(app.root_path, 'data', 'sassa_payment_dates.json')),
+    os.getenv('SASSA_OVERLAY_PATH', os.path.join(STATE_DIR, 'sassa_payment_dates.json'))
+)
+if not LAZY_STARTUP:
+    sassa_calendar.load()
+
+# =========== ADMIN AUTH ===========
+ADMIN_USERNAME = os.getenv('ADMIN_USERNAME', 'admin')
+ADMIN_PASSWORD = os.getenv('ADMIN_PASSWORD')
+# Sessions signed with the built-in fallback key could be forged by anyone
+# who has read this file, so admin stays off without a real secret
+ADMIN_ENABLED = ADMIN_PASSWORD is not None and bool(os.getenv('FLASK_SECRET_KEY'))
+if ADMIN_PASSWORD is not None and not ADMIN_ENABLED:
+    logger.error("ADMIN_PASSWORD is set but FLASK_SECRET_KEY is not; admin routes are disabled")
+
+def is_admin():
+    return ADMIN_ENABLED and session.get('admin') is True
+
+def same_origin():
+    # CORS is open to every origin, so state-changing admin calls must come from our own pages
+    origin = request.headers.get('Origin')
+    return origin is None or origin.split('://', 1)[-1] == request.host
+
+def require_admin(view):
+    """Reject non-admin requests with the usual JSON error shape"""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if not is_admin() or not same_origin():
+            return jsonify({
+                'success': False,
+                'error': 'Admin login required',
+                'timestamp': datetime.now().isoformat()
+            }), 401
+        return view(*args, **kwargs)
+    return wrapper
+
+# =========== CONTACT OUTBOX ===========
+# Render terminates TLS in front of the app and appends the caller's address
+# to X-Forwarded-For; count that many hops from the right
+TRUSTED_PROXY_HOPS = int(os.getenv('TRUSTED_PROXY_HOPS', 1))
+
+def client_ip():
+    forwarded = [part.strip() for part in request.headers.get('X-Forwarded-For', '').split(',') if part.strip()]
+    if TRUSTED_PROXY_HOPS and len(forwarded) >= TRUSTED_PROXY_HOPS:
+        return forwarded[-TRUSTED_PROXY_HOPS]
+    return request.remote_addr or 'unknown'
+
+class FileContactSink:
+    """Append delivered submissions to a JSON lines file"""
+    
+    name = 'file'
+    
+    def __init__(self, path):
+        self.path = path
+    
+    def deliver(self, submissions):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, 'a', encoding='utf-8') as f:
+            for submission in submissions:
+                f.write(json.dumps(submission, ensure_ascii=False) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+
+class FirestoreContactSink:
+    """Write submissions to a Firestore collection, one batch per flush"""
+    
+    name = 'firestore'
+    
+    def __init__(self, collection, credentials_path=None):
+        self.collection = collection
+        self.credentials_path = credentials_path
+        self.client = None
+    
+    def _connect(self):
+        if self.client is None:
+            # Imported here so workers that never flush don't pay for the SDK
+            import firebase_admin
+            from firebase_admin import credentials, firestore
+            
+            if not firebase_admin._apps:
+                credential = credentials.Certificate(self.credentials_path) if self.credentials_path else None
+                firebase_admin.initialize_app(credential)
+            self.client = firestore.client()
+        return self.client
+    
+    def deliver(self, submissions):
+        client = self._connect()
+        batch = client.batch()
+        for submission in submissions:
+            # Outbox ids make retried batches overwrite instead of duplicating
+            batch.set(client.collection(self.collection).document(submission['id']), submission)
+        batch.commit()
+
+CONTACT_FIELD_LIMITS = {'name': 120, 'email': 254, 'subject': 200, 'message': 5000}
+EMAIL_PATTERN = re.compile(r'^[^@\s]+@[^@\s]+\.[^@\s]+$')
+
+class ContactOutbox:
+    """
+    Durable write-behind queue for contact form submissions. The request only
+    inserts a row into a local SQLite outbox and returns; a background worker
+    delivers pending rows to the sink in batches, retrying with exponential
+    backoff. Rows are claimed with a lease so several workers sharing the file
+    never deliver the same batch concurrently. Identical messages and bursts
+    from one client are rejected at enqueue time.
+    """
+    
+    LEASE = 120
+    
+    def __init__(self, path, sink, batch_size=25, interval=10, max_attempts=8, dedup_window=86400,
+                 ip_limit=5, ip_window=600, retention=30 * 86400):
+        self.path = path
+        self.sink = sink
+        self.batch_size = batch_size
+        self.interval = interval
+        self.max_attempts = max_attempts
+        self.dedup_window = dedup_window
+        self.ip_limit = ip_limit
+        self.ip_window = ip_window
+        self.retention = retention
+        self.lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self.conn = None
+        self.thread = None
+        self.last_error = None
+        self.stats = {'queued': 0, 'duplicates': 0, 'throttled': 0, 'delivered': 0, 'retries': 0, 'failed': 0, 'flushes': 0}
+    
+    def _connect(self):
+        if self.conn is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            # Acknowledged submissions must survive a power cut, not just a crash
+            conn.execute('PRAGMA synchronous=FULL')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS outbox (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    fingerprint TEXT NOT NULL,
+                    client TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    created REAL NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    next_attempt REAL NOT NULL,
+                    last_error TEXT
+                )
+            ''')
+            conn.execute('CREATE INDEX IF NOT EXISTS outbox_due ON outbox (status, next_attempt)')
+            conn.execute('CREATE INDEX IF NOT EXISTS outbox_fingerprint ON outbox (fingerprint, created)')
+            conn.execute('CREATE INDEX IF NOT EXISTS outbox_client ON outbox (client, created)')
+            self.conn = conn
+        return self.conn
+    
+    @staticmethod
+    def fingerprint(submission):
+        normalized = '\x00'.join(' '.join(str(submission.get(field, '')).lower().split())
+                                 for field in ('email', 'subject', 'message'))
+        return hashlib.sha1(normalized.encode('utf-8')).hexdigest()
+    
+    def enqueue(self, submission, ip):
+        """Persist a submission; returns 'queued', 'duplicate' or 'throttled'"""
+        now = time.time()
+        fingerprint = self.fingerprint(submission)
+        # Only a keyed hash of the address is kept, it is needed for throttling alone;
+        # without the app secret it cannot be reversed by hashing the IPv4 space
+        client = hmac.new(app.secret_key.encode('utf-8'), ip.encode('utf-8'), hashlib.sha256).hexdigest()[:16]
+        
+        with self.lock:
+            conn = self._connect()
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                if conn.execute('SELECT 1 FROM outbox WHERE fingerprint = ? AND created > ? LIMIT 1',
+                                (fingerprint, now - self.dedup_window)).fetchone():
+                    outcome = 'duplicate'
+                elif conn.execute('SELECT COUNT(*) FROM outbox WHERE client = ? AND created > ?',
+                                  (client, now - self.ip_window)).fetchone()[0] >= self.ip_limit:
+                    outcome = 'throttled'
+                else:
+                    conn.execute('INSERT INTO outbox (fingerprint, client, payload, created, next_attempt) '
+                                 'VALUES (?, ?, ?, ?, ?)',
+                                 (fingerprint, client, json.dumps(submission, ensure_ascii=False), now, now))
+                    outcome = 'queued'
+                conn.execute('COMMIT')
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
+            self.stats[outcome if outcome != 'duplicate' else 'duplicates'] += 1
+        
+        if outcome == 'queued':
+            self.wakeup.set()
+        return outcome
+    
+    def _claim(self, now):
+        with self.lock:
+            conn = self._connect()
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                rows = conn.execute(
+                    "SELECT id, payload, created, attempts FROM outbox "
+                    "WHERE status = 'pending' AND next_attempt <= ? ORDER BY id LIMIT ?",
+                    (now, self.batch_size)
+                ).fetchall()
+                conn.executemany('UPDATE outbox SET next_attempt = ? WHERE id = ?',
+                                 [(now + self.LEASE, row[0]) for row in rows])
+                conn.execute('COMMIT')
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
+        return rows
+    
+    def flush(self):
+        """Deliver one batch of due submissions; returns how many were delivered"""
+        now = time.time()
+        rows = self._claim(now)
+        if not rows:
+            return 0
+        
+        submissions = [
+            dict(json.loads(payload), id=f"outbox-{row_id}",
+                 received_at=datetime.fromtimestamp(created, timezone.utc).isoformat())
+            for row_id, payload, created, _ in rows
+        ]
+        self.stats['flushes'] += 1
+        
+        try:
+            self.sink.deliver(submissions)
+        except Exception as e:
+            self.last_error = f"{type(e).__name__}: {str(e)}"
+            logger.error(f"Contact outbox delivery error ({self.sink.name}, {len(rows)} messages): {self.last_error}")
+            updates = []
+            for row_id, _, _, attempts in rows:
+                attempts += 1
+                status = 'failed' if attempts >= self.max_attempts else 'pending'
+                self.stats['failed' if status == 'failed' else 'retries'] += 1
+                updates.append((status, attempts, now + min(30 * 2 ** attempts, 6 * 3600), self.last_error, row_id))
+            with self.lock:
+                self.conn.executemany(
+                    'UPDATE outbox SET status = ?, attempts = ?, next_attempt = ?, last_error = ? WHERE id = ?', updates)
+            return 0
+        
+        with self.lock:
+            self.conn.executemany("UPDATE outbox SET status = 'sent', attempts = attempts + 1 WHERE id = ?",
+                                  [(row[0],) for row in rows])
+        self.stats['delivered'] += len(rows)
+        self.last_error = None
+        return len(rows)
+    
+    def flush_all(self):
+        """Flush until nothing is due or a batch fails"""
+        delivered = 0
+        while True:
+            count = self.flush()
+            delivered += count
+            if count < self.batch_size:
+                return delivered
+    
+    def prune(self):
+        """Forget delivered rows once they no longer matter for dedup and throttling"""
+        with self.lock:
+            return self._connect().execute("DELETE FROM outbox WHERE status = 'sent' AND created < ?",
+                                           (time.time() - max(self.retention, self.dedup_window),)).rowcount
+    
+    def start(self):
+        if self.thread is None or not self.thread.is_alive():
+            self.thread = threading.Thread(target=self._run, name='contact-outbox', daemon=True)
+            self.thread.start()
+    
+    def _run(self):
+        last_prune = 0
+        while True:
+            # A new submission wakes the worker early; retries wait for the next tick
+            self.wakeup.wait(self.interval)
+            self.wakeup.clear()
+            try:
+                self.flush_all()
+                if time.time() - last_prune > 3600:
+                    self.prune()
+                    last_prune = time.time()
+            except Exception as e:
+                logger.error(f"Contact outbox worker error: {str(e)}")
+    
+    def report(self):
+        stats = dict(self.stats, sink=self.sink.name, last_error=self.last_error)
+        try:
+            with self.lock:
+                stats['outbox'] = dict(self._connect().execute(
+                    'SELECT status, COUNT(*) FROM outbox GROUP BY status').fetchall())
+        except sqlite3.Error as e:
+            stats['error'] = str(e)
+        return stats
+
+FIREBASE_CREDENTIALS = os.getenv('FIREBASE_CREDENTIALS')
+CONTACT_SINK = os.getenv('CONTACT_SINK', 'firestore' if FIREBASE_CREDENTIALS else 'file').lower()
+
+contact_outbox = ContactOutbox(
+    os.getenv('CONTACT_OUTBOX_PATH', os.path.join(STATE_DIR, 'contact_outbox.sqlite3')),
+    FirestoreContactSink(os.getenv('FIREBASE_CONTACT_COLLECTION', 'contact_messages'), FIREBASE_CREDENTIALS)
+    if CONTACT_SINK == 'firestore' else
+    FileContactSink(os.getenv('CONTACT_SINK_PATH', os.path.join(STATE_DIR, 'contact_messages.jsonl'))),
+    ip_limit=int(os.getenv('CONTACT_IP_LIMIT', 5)),
+    ip_window=int(os.getenv('CONTACT_IP_WINDOW', 600)),
+)
+
+# =========== RATE LIMITING ===========
+def rate_limit_setting(name, per_minute, burst):
+    return (float(os.getenv(f"RATE_LIMIT_{name}_PER_MINUTE", per_minute)),
+            int(os.getenv(f"RATE_LIMIT_{name}_BURST", burst)))
+
+# (bucket, path prefix, (requests per minute, burst)); the first matching prefix wins
+RATE_LIMITS = [
+    # Password guessing: a handful of attempts, then one every 12 seconds
+    ('admin_login', '/admin/login', rate_limit_setting('ADMIN_LOGIN', 5, 5)),
+    ('weather', '/api/weather', rate_limit_setting('WEATHER', 30, 20)),
+    ('sports', '/api/sports', rate_limit_setting('SPORTS', 120, 60)),
+    ('api', '/api/', rate_limit_setting('API', 120, 60)),
+]
+
+class RateLimiter:
+    """
+    Per-client GCRA limiter. Each (bucket, client) key stores only its
+    theoretical arrival time: a request is allowed if that time is no more
+    than the burst allowance ahead of now, and every allowed request pushes
+    it one emission interval further. Keys live in a dict for a single
+    worker, or in a SQLite table when workers on the host should share one
+    budget.
+    """
+    
+    def __init__(self, limits, path=None, max_keys=50000):
+        self.limits = limits
+        self.path = path
+        self.max_keys = max_keys
+        self.tats = {}
+        self.lock = threading.Lock()
+        self.conn = None
+        self.last_prune = time.time()
+        self.stats = {'allowed': 0, 'limited': 0}
+        self.limited_by_bucket = {}
+    
+    def _connect(self):
+        if self.conn is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=1, check_same_thread=False, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            # Counters are disposable; losing the last writes on a crash is fine
+            conn.execute('PRAGMA synchronous=OFF')
+            conn.execute('CREATE TABLE IF NOT EXISTS gcra (key TEXT PRIMARY KEY, tat REAL NOT NULL) WITHOUT ROWID')
+            self.conn = conn
+        return self.conn
+    
+    def match(self, path):
+        for bucket, prefix, limit in self.limits:
+            if path.startswith(prefix):
+                return bucket, limit
+        return None, None
+    
+    def hit(self, bucket, limit, client, now=None):
+        """Count one request; returns 0 if allowed, else seconds until it would be"""
+        per_minute, burst = limit
+        interval = 60 / per_minute
+        allowance = burst * interval
+        key = f"{bucket}:{client}"
+        now = time.time() if now is None else now
+        
+        with self.lock:
+            if self.path:
+                retry_after = self._hit_shared(key, now, interval, allowance)
+            else:
+                tat = max(self.tats.get(key, now), now) + interval
+                retry_after = tat - now - allowance
+                if retry_after <= 0:
+                    self.tats[key] = tat
+                    if len(self.tats) > self.max_keys and now - self.last_prune > 10:
+                        self._prune(now)
+            
+            if retry_after > 0:
+                self.stats['limited'] += 1
+                self.limited_by_bucket[bucket] = self.limited_by_bucket.get(bucket, 0) + 1
+                return retry_after
+            self.stats['allowed'] += 1
+            return 0
+    
+    def _hit_shared(self, key, now, interval, allowance):
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            row = conn.execute('SELECT tat FROM gcra WHERE key = ?', (key,)).fetchone()
+            tat = max(row[0] if row else now, now) + interval
+            retry_after = tat - now - allowance
+            if retry_after <= 0:
+                conn.execute('INSERT OR REPLACE INTO gcra VALUES (?, ?)', (key, tat))
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        
+        if now - self.last_prune > 300:
+            self._prune(now)
+        return retry_after
+    
+    def _prune(self, now):
+        """Forget clients whose allowance has fully recovered"""
+        self.last_prune = now
+        if self.path:
+            self.conn.execute('DELETE FROM gcra WHERE tat < ?', (now,))
+        else:
+            self.tats = {key: tat for key, tat in self.tats.items() if tat > now}
+    
+    def report(self):
+        return dict(
+            self.stats,
+            backend='sqlite' if self.path else 'memory',
+            limited_by_bucket=dict(self.limited_by_bucket),
+            tracked_clients=None if self.path else len(self.tats),
+            limits={bucket: {'per_minute': limit[0], 'burst': limit[1]} for bucket, _, limit in self.limits},
+        )
 
-# =========== WEATHER SERVICE WITH HOURLY FORECAST ===========
-class WeatherService:
-    """Get weather data from OpenWeatherMap with hourly forecast"""
+RATE_LIMITING = os.getenv('RATE_LIMITING', '1') == '1'
+rate_limiter = RateLimiter(
+    RATE_LIMITS,
+    # Shared mode gives every gunicorn worker on the host one budget per client
+    path=os.getenv('RATE_LIMIT_PATH', os.path.join(STATE_DIR, 'ratelimit.sqlite3'))
+    if os.getenv('RATE_LIMIT_BACKEND', 'memory') == 'sqlite' else None,
+)
+
+@app.before_request
+def enforce_rate_limit():
+    if not RATE_LIMITING:
+        return None
+    bucket, limit = rate_limiter.match(request.path)
+    if bucket is None:
+        return None
     
-    @staticmethod
-    def get_weather_with_forecast(lat: float, lon: float):
-        """Get current weather AND 5-day forecast WITH HOURLY DATA"""
-        cache_key = f"weather_forecast_{lat}_{lon}"
-        cached = cache.get(cache_key, 300)
-        if cached:
-            cached['cached'] = True
-            return cached
+    try:
+        retry_after = rate_limiter.hit(bucket, limit, client_ip())
+    except sqlite3.Error as e:
+        # Never turn a limiter problem into an outage
+        logger.error(f"Rate limiter error: {str(e)}")
+        return None
+    
+    if retry_after:
+        response = jsonify({
+            'success': False,
+            'error': 'Too many requests, please slow down',
+            'retry_after': math.ceil(retry_after),
+            'timestamp': datetime.now().isoformat()
+        })
+        response.status_code = 429
+        response.headers['Retry-After'] = str(math.ceil(retry_after))
+        return response
+    return None
+
+# =========== TRENDING ===========
+# Page routes whose views count towards trending, besides /article/<name>
+TRENDING_PAGES = {
+    'sassa': 'SASSA Grants & Payment Dates',
+    'sports': 'Football Scores & Standings',
+    'weather': 'South African Weather',
+    'howto': 'How-To Guides',
+    'news': 'South African News',
+    'faq': 'Frequently Asked Questions',
+}
+TRENDING_BOT_MARKERS = ('bot', 'spider', 'crawl', 'slurp', 'preview')
+
+class TrendingCounter:
+    """
+    Decayed view counts for pages and articles, shared by every worker through
+    a small SQLite table. Recording a view is a single deque append with no
+    lock; a flush drains the deque, merges the batch into the table (decaying
+    the stored scores by their age at the configured half-life) and rebuilds
+    the top-K list and its encoded JSON, so readers never sort anything.
+    The counted paths are a fixed set of routes, which keeps exact counters
+    smaller than a sketch would be.
+    """
+    
+    def __init__(self, path, half_life=6 * 3600, top_k=10, interval=30, max_pending=100000):
+        self.path = path
+        self.half_life = half_life
+        self.top_k = top_k
+        self.interval = interval
+        self.pending = deque(maxlen=max_pending)
+        self.lock = threading.Lock()
+        self.conn = None
+        self.thread = None
+        self.top = []
+        self.top_json = encode_json({'success': True, 'items': [], 'updated': None})
+        self.version = 0
+        self.refreshed = 0
+        self.stats = {'flushes': 0, 'views_flushed': 0}
+    
+    def _connect(self):
+        if self.conn is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute('CREATE TABLE IF NOT EXISTS trending (path TEXT PRIMARY KEY, score REAL NOT NULL, '
+                         'updated REAL NOT NULL) WITHOUT ROWID')
+            self.conn = conn
+        return self.conn
+    
+    def record(self, path):
+        self.pending.append(path)
+    
+    def decayed(self, score, age):
+        return score * 0.5 ** (max(age, 0) / self.half_life)
+    
+    def flush(self):
+        """Merge pending views into the shared table and rebuild the top-K"""
+        views = {}
+        pending = self.pending
+        while pending:
+            try:
+                path = pending.popleft()
+            except IndexError:
+                break
+            views[path] = views.get(path, 0) + 1
         
-        try:
-            current_url = "https://api.openweathermap.org/data/2.5/weather"
-            current_params = {
-                'lat': lat,
-                'lon': lon,
-                'appid': API_KEYS['weather'],
-                'units': 'metric',
-                'lang': 'en'
-            }
-            
-            forecast_url = "https://api.openweathermap.org/data/2.5/forecast"
-            forecast_params = {
-                'lat': lat,
-                'lon': lon,
-                'appid': API_KEYS['weather'],
-                'units': 'metric',
-                'lang': 'en',
-                'cnt': 40
-            }
-            
-            current_response = requests.get(current_url, params=current_params, timeout=10)
-            forecast_response = requests.get(forecast_url, params=forecast_params, timeout=10)
+        now = time.time()
+        with self.lock:
+            conn = self._connect()
+            if views:
+                conn.execute('BEGIN IMMEDIATE')
+                try:
+                    placeholders = ','.join('?' * len(views))
+                    stored = dict((path, (score, updated)) for path, score, updated in conn.execute(
+                        f"SELECT path, score, updated FROM trending WHERE path IN ({placeholders})", list(views)))
+                    merged = []
+                    for path, count in views.items():
+                        if path in stored:
+                            score, updated = stored[path]
+                            count += self.decayed(score, now - updated)
+                        merged.append((path, count, now))
+                    conn.executemany('INSERT OR REPLACE INTO trending VALUES (?, ?, ?)', merged)
+                    conn.execute('COMMIT')
+                except Exception:
+                    conn.execute('ROLLBACK')
+                    raise
+                self.stats['flushes'] += 1
+                self.stats['views_flushed'] += sum(views.values())
             
-            if current_response.status_code == 200 and forecast_response.status_code == 200:
-                current_data = current_response.json()
-                forecast_data = forecast_response.json()
-                
-                # Process current weather
-                current_weather = {
-                    'temp': round(current_data['main']['temp']),
-                    'feels_like': round(current_data['main']['feels_like']),
-                    'humidity': current_data['main']['humidity'],
-                    'pressure': current_data['main']['pressure'],
-                    'wind_speed': round(current_data['wind']['speed'] * 3.6, 1),
-                    'wind_deg': current_data['wind'].get('deg', 0),
-                    'description': current_data['weather'][0]['description'].title(),
-                    'icon': current_data['weather'][0]['icon'],
-                    'visibility': current_data.get('visibility', 10000) / 1000,
-                    'clouds': current_data.get('clouds', {}).get('all', 0),
-                    'sunrise': datetime.fromtimestamp(current_data['sys']['sunrise']).astimezone(sa_timezone).strftime('%H:%M'),
-                    'sunset': datetime.fromtimestamp(current_data['sys']['sunset']).astimezone(sa_timezone).strftime('%H:%M'),
-                    'timestamp': datetime.now().isoformat(),
-                }
-                
-                # Process hourly forecast
-                hourly_forecast = []
-                
-                for item in forecast_data['list'][:12]:
-                    dt = datetime.fromtimestamp(item['dt'])
-                    time_str = dt.strftime('%I %p').lstrip('0')
-                    
-                    hourly_forecast.append({
-                        'time': time_str,
-                        'temp': round(item['main']['temp']),
-                        'feels_like': round(item['main']['feels_like']),
-                        'description': item['weather'][0]['description'].title(),
-                        'icon': item['weather'][0]['icon'],
-                        'humidity': item['main']['humidity'],
-                        'wind_speed': round(item['wind']['speed'] * 3.6, 1),
-                        'pop': round(item.get('pop', 0) * 100),
-                        'clouds': item.get('clouds', {}).get('all', 0)
-                    })
-                
-                # Process 5-day forecast
-                forecast_list = []
-                daily_forecast = {}
-                
-                for item in forecast_data['list']:
-                    dt = datetime.fromtimestamp(item['dt'])
-                    date_key = dt.strftime('%Y-%m-%d')
-                    
-                    if date_key not in daily_forecast:
-                        daily_forecast[date_key] = {
-                            'date': dt,
-                            'temps': [],
-                            'icons': [],
-                            'descriptions': []
-                        }
-                    
-                    daily_forecast[date_key]['temps'].append(item['main']['temp'])
-                    daily_forecast[date_key]['icons'].append(item['weather'][0]['icon'])
-                    daily_forecast[date_key]['descriptions'].append(item['weather'][0]['description'])
-                
-                forecast_days = []
-                today_date = datetime.now().date()
-                
-                for i, (date_key, day_data) in enumerate(sorted(daily_forecast.items())[:6]):
-                    if datetime.strptime(date_key, '%Y-%m-%d').date() <= today_date:
-                        continue
-                    
-                    temps = day_data['temps']
-                    day_name = day_data['date'].strftime('%a')
-                    month_day = day_data['date'].strftime('%b %d')
-                    
-                    icon_counts = {}
-                    for icon in day_data['icons']:
-                        icon_counts[icon] = icon_counts.get(icon, 0) + 1
-                    most_common_icon = max(icon_counts, key=icon_counts.get)
-                    
-                    desc_counts = {}
-                    for desc in day_data['descriptions']:
-                        desc_counts[desc] = desc_counts.get(desc, 0) + 1
-                    most_common_desc = max(desc_counts, key=desc_counts.get)
-                    
-                    forecast_days.append({
-                        'date': date_key,
-                        'day': day_name,
-                        'month_day': month_day,
-                        'temp': round(sum(temps) / len(temps)),
-                        'temp_min': round(min(temps)),
-                        'temp_max': round(max(temps)),
-                        'icon': most_common_icon,
-                        'description': most_common_desc.title()
-                    })
-                
-                weather_data = {
-                    'success': True,
-                    'current': current_weather,
-                    'hourly': hourly_forecast[:8],
-                    'forecast': forecast_days[:5],
-                    'cached': False
-                }
-                
-                cache.set(cache_key, weather_data)
-                return weather_data
-                
-        except Exception as e:
-            logger.error(f"Weather API error: {str(e)}")
+            rows = conn.execute('SELECT path, score, updated FROM trending').fetchall()
+            scores = [(self.decayed(score, now - updated), path) for path, score, updated in rows]
+            # Anything decayed below a hundredth of a view is gone for good
+            stale = [(path,) for score, path in scores if score < 0.01]
+            if stale:
+                conn.executemany('DELETE FROM trending WHERE path = ?', stale)
         
-        return None
+        scores.sort(reverse=True)
+        top = [dict(trending_item(path), score=round(score, 2)) for score, path in scores[:self.top_k] if score >= 0.01]
+        if [item['path'] for item in top] != [item['path'] for item in self.top]:
+            self.version += 1
+        self.top = top
+        self.top_json = encode_json({
+            'success': True,
+            'items': top,
+            'half_life_hours': round(self.half_life / 3600, 2),
+            'updated': datetime.now().isoformat(),
+        })
+        self.refreshed = now
+        return len(views)
+    
+    def refresh_if_stale(self):
+        """Flush from the request path when no background worker has done so lately"""
+        if time.time() - self.refreshed > self.interval:
+            # Claim the refresh first so concurrent requests don't all flush
+            self.refreshed = time.time()
+            self.flush_quietly()
+    
+    def flush_quietly(self):
+        try:
+            self.flush()
+        except Exception as e:
+            logger.error(f"Trending flush error: {str(e)}")
+    
+    def start(self):
+        if self.thread is None or not self.thread.is_alive():
+            self.thread = threading.Thread(target=self._run, name='trending-flush', daemon=True)
+            self.thread.start()
+    
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            self.flush_quietly()
+    
+    def report(self):
+        return dict(self.stats, pending=len(self.pending), top=[item['path'] for item in self.top],
+                    version=self.version)
+
+@lru_cache(maxsize=256)
+def trending_item(path):
+    """Title and kind for a counted path"""
+    if path.startswith('/article/'):
+        slug = path[len('/article/'):]
+        title = next((guide['title'] for guide in HOMEPAGE_GUIDES if guide['url'] == path), None)
+        if title is None:
+            try:
+                with open(os.path.join(app.root_path, 'templates', 'guides', f"{slug}.html"), encoding='utf-8') as f:
+                    match = re.search(r'<title>([^<|]+)', f.read(4096))
+                title = match.group(1).strip() if match else None
+            except OSError:
+                title = None
+        return {'path': path, 'title': title or slug.replace('-', ' ').title(), 'kind': 'article'}
+    return {'path': path, 'title': TRENDING_PAGES.get(path.strip('/'), path), 'kind': 'page'}
+
+trending = TrendingCounter(
+    os.getenv('TRENDING_PATH', os.path.join(STATE_DIR, 'trending.sqlite3')),
+    half_life=float(os.getenv('TRENDING_HALF_LIFE_HOURS', 6)) * 3600,
+    top_k=int(os.getenv('TRENDING_TOP_K', 10)),
+    interval=int(os.getenv('TRENDING_FLUSH_INTERVAL', 30)),
+)
+
+@app.after_request
+def count_page_view(response):
+    if (response.status_code == 200 and request.method == 'GET'
+            and (request.endpoint == 'article' or request.endpoint in TRENDING_PAGES)):
+        user_agent = request.headers.get('User-Agent', '').lower()
+        if user_agent and not any(marker in user_agent for marker in TRENDING_BOT_MARKERS):
+            trending.record(request.path)
+    return response
+
+startup.mark('services')
 
 # =========== ROUTES ===========
 
 @app.route('/')
 def index():
     """Homepage"""
+    # The page has no live data, so it only changes when the date does
+    today = datetime.now(sa_timezone).date()
     try:
-        football_service = FootballDataService()
-        live_data = football_service.get_live_matches()
-        standings_data = football_service.get_standings()
-        
-        # Get list of guides for homepage
-        guides = [
-            {
-                'title': 'How to Check SASSA Status Online',
-                'description': 'Step-by-step guide for South Africans to check their SASSA grant status online.',
-                'url': '/article/sassa-status-check',
-                'image': 'sassa-status.jpg',
-                'category': 'SASSA'
-            },
-            {
-                'title': 'How to Make Money Online in South Africa',
-                'description': 'Legitimate ways to earn money online from South Africa in 2026.',
-                'url': '/article/make-money-online-sa',
-                'image': 'make-money.jpg',
-                'category': 'Finance'
-            },
-            {
-                'title': 'How to Write a CV in South Africa',
-                'description': 'Create a professional CV that stands out to South African employers.',
-                'url': '/article/how-to-write-cv-sa',
-                'image': 'cv-writing.jpg',
-                'category': 'Career'
-            },
-            {
-                'title': 'Best Job Websites in South Africa',
-                'description': 'Top platforms to find employment opportunities in South Africa.',
-                'url': '/article/best-job-websites-sa',
-                'image': 'job-websites.jpg',
-                'category': 'Career'
-            },
-            {
-                'title': 'How Students Can Make Money Online',
-                'description': 'Practical online income opportunities for South African students.',
-                'url': '/article/students-make-money-online',
-                'image': 'students-money.jpg',
-                'category': 'Finance'
-            },
-            {
-                'title': 'How to Start an Online Business in South Africa',
-                'description': 'Complete guide to launching your online business in South Africa.',
-                'url': '/article/start-online-business-sa',
-                'image': 'online-business.jpg',
-                'category': 'Business'
-            }
-        ]
-        
-        return render_template('index.html',
-                             sports_data=live_data,
-                             standings_data=standings_data,
-                             guides=guides,
-                             current_year=datetime.now().year,
-                             page_title='SA Daily Portal 2026 - South African Information Hub',
-                             page_description='Your complete guide to South African weather, SASSA grants, European football, and helpful how-to guides.',
-                             current_date=datetime.now().strftime('%d %B %Y'))
+        return page_fragments.render('index', today, lambda: render_template(
+            'index.html',
+            guides=HOMEPAGE_GUIDES,
+            current_year=today.year,
+            page_title='SA Daily Portal 2026 - South African Information Hub',
+            page_description='Your complete guide to South African weather, SASSA grants, European football, and helpful how-to guides.',
+            current_date=today.strftime('%d %B %Y')))
         
     except Exception as e:
         logger.error(f"Homepage error: {str(e)}")
@@ -1045,9 +3985,11 @@ def terms():
 
 
 @app.route('/trending')
-def trending():
-    # Read the HTML file you saved
-    return render_template('trending.html')                       
+def trending_page():
+    """News hub with the most read pages, re-rendered only when the ranking changes"""
+    trending.refresh_if_stale()
+    return page_fragments.render('trending', trending.version,
+                                 lambda: render_template('trending.html', trending_items=trending.top))
 
 @app.route('/disclaimer')
 def disclaimer():
@@ -1086,6 +4028,7 @@ def api_weather():
                 lat_float = float(lat)
                 lon_float = float(lon)
                 coordinates = (lat_float, lon_float)
+                weather_warmer.record_point(lat_float, lon_float)
                 
                 reverse_data = location_service.reverse_geocode(lat_float, lon_float)
                 if reverse_data:
@@ -1102,20 +4045,17 @@ def api_weather():
             return jsonify({'success': False, 'error': 'Location required'}), 400
         
         lat, lon = coordinates
-        weather_data = weather_service.get_weather_with_forecast(lat, lon)
+        weather_data = weather_service.get_weather_with_forecast(lat, lon, as_json=True)
         
         if weather_data:
-            response_data = {
-                'success': weather_data.get('success', False),
+            # Cached forecasts arrive pre-encoded; only the per-request keys are added
+            if not isinstance(weather_data, bytes):
+                weather_data = encode_json(weather_data)
+            return json_response(extend_json(weather_data, {
                 'location': location_name,
                 'coordinates': {'lat': lat, 'lon': lon},
-                'current': weather_data.get('current', {}),
-                'hourly': weather_data.get('hourly', []),
-                'forecast': weather_data.get('forecast', []),
                 'timestamp': datetime.now().isoformat(),
-                'cached': weather_data.get('cached', False)
-            }
-            return jsonify(response_data)
+            }))
         else:
             return jsonify({
                 'success': False,
@@ -1131,13 +4071,104 @@ def api_weather():
             'timestamp': datetime.now().isoformat()
         }), 503
 
+@app.route('/api/weather/current', methods=['GET'])
+@app.route('/api/weather/forecast', methods=['GET'])
+def api_weather_proxy():
+    """OpenWeatherMap current weather or forecast by city name or coordinates, cached server-side"""
+    kind = 'current' if request.path.endswith('/current') else 'forecast'
+    city = ' '.join(request.args.get('city', '').split())[:60]
+    lat = request.args.get('lat')
+    lon = request.args.get('lon')
+    
+    try:
+        if city:
+            weather_data = WeatherService.get_city_weather(kind, city=city, as_json=True)
+        elif lat and lon:
+            try:
+                weather_data = WeatherService.get_city_weather(kind, lat=float(lat), lon=float(lon), as_json=True)
+            except ValueError:
+                return jsonify({'success': False, 'error': 'Invalid coordinates'}), 400
+        else:
+            return jsonify({'success': False, 'error': 'City or coordinates required'}), 400
+        
+        if weather_data is None:
+            return jsonify({
+                'success': False,
+                'error': 'Weather service temporarily unavailable',
+                'timestamp': datetime.now().isoformat()
+            }), 503
+        if isinstance(weather_data, dict) and weather_data.get('success') is False:
+            return jsonify(weather_data), 404
+        return json_response(weather_data)
+    
+    except Exception as e:
+        logger.error(f"Weather proxy API error: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': 'Weather service temporarily unavailable',
+            'timestamp': datetime.now().isoformat()
+        }), 503
+
+@app.route('/api/weather/batch', methods=['GET', 'POST'])
+def api_weather_batch():
+    """Weather for several cities or coordinates in one round trip"""
+    if request.method == 'POST':
+        payload = request.get_json(silent=True)
+        if payload is None:
+            payload = {}
+        if not isinstance(payload, dict):
+            return jsonify({'success': False, 'error': 'Expected a JSON object'}), 400
+        cities = payload.get('cities', [])
+        coordinates = payload.get('coordinates', [])
+        if not isinstance(cities, list) or not isinstance(coordinates, list):
+            return jsonify({'success': False, 'error': 'cities and coordinates must be lists'}), 400
+        include_forecast = bool(payload.get('forecast', False))
+    else:
+        cities = [city for city in request.args.get('cities', '').split(',') if city.strip()]
+        coordinates = []
+        for pair in request.args.get('coords', '').split(';'):
+            if pair.strip():
+                lat, _, lon = pair.partition(',')
+                coordinates.append({'lat': lat, 'lon': lon})
+        include_forecast = request.args.get('forecast') in ('1', 'true')
+    
+    locations = []
+    for city in cities:
+        name = SA_CITY_LOOKUP.get(str(city).strip().lower())
+        if name is None:
+            return jsonify({'success': False, 'error': f'Unknown city: {city}', 'cities': list(SA_CITIES)}), 400
+        lat, lon = SA_CITIES[name]
+        locations.append({'name': name, 'lat': lat, 'lon': lon})
+    
+    for point in coordinates:
+        try:
+            lat, lon = float(point['lat']), float(point['lon'])
+        except (KeyError, TypeError, ValueError):
+            return jsonify({'success': False, 'error': 'Invalid coordinates'}), 400
+        locations.append({'name': point.get('name') or f"{lat:.4f}, {lon:.4f}", 'lat': lat, 'lon': lon})
+    
+    if not locations:
+        return jsonify({'success': False, 'error': 'Cities or coordinates required'}), 400
+    if len(locations) > WEATHER_BATCH_MAX_LOCATIONS:
+        return jsonify({'success': False, 'error': f'At most {WEATHER_BATCH_MAX_LOCATIONS} locations per request'}), 400
+    
+    try:
+        return json_response(WeatherService.get_weather_batch(locations, include_forecast))
+    except Exception as e:
+        logger.error(f"Batch weather API error: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': 'Weather service temporarily unavailable',
+            'timestamp': datetime.now().isoformat()
+        }), 503
+
 @app.route('/api/sports/matches', methods=['GET'])
 def api_sports_matches():
     """Today's matches"""
     try:
         football_service = FootballDataService()
-        matches_data = football_service.get_todays_matches()
-        return jsonify(matches_data)
+        matches_data = football_service.get_todays_matches(as_json=True)
+        return json_response(matches_data)
     except Exception as e:
         logger.error(f"Matches API error: {str(e)}")
         return jsonify({
@@ -1148,11 +4179,19 @@ def api_sports_matches():
 
 @app.route('/api/sports/standings', methods=['GET'])
 def api_sports_standings():
-    """Standings"""
+    """Standings for one competition (Premier League by default)"""
+    competition = request.args.get('competition', 'PL').strip().upper()
+    if competition not in FOOTBALL_COMPETITIONS:
+        return jsonify({
+            'success': False,
+            'error': f'Unsupported competition: {competition}',
+            'competitions': FOOTBALL_COMPETITIONS
+        }), 400
+    
     try:
         football_service = FootballDataService()
-        standings_data = football_service.get_standings()
-        return jsonify(standings_data)
+        standings_data = football_service.get_standings(competition, as_json=True)
+        return json_response(standings_data)
     except Exception as e:
         logger.error(f"Standings API error: {str(e)}")
         return jsonify({
@@ -1161,13 +4200,27 @@ def api_sports_standings():
             'timestamp': datetime.now().isoformat()
         }), 503
 
+@app.route('/api/sports/standings/all', methods=['GET'])
+def api_sports_standings_all():
+    """Standings for every competition, served from cache only"""
+    try:
+        football_service = FootballDataService()
+        return json_response(football_service.get_all_standings(as_json=True))
+    except Exception as e:
+        logger.error(f"All standings API error: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': 'Standings service updating',
+            'timestamp': datetime.now().isoformat()
+        }), 503
+
 @app.route('/api/sports/live', methods=['GET'])
 def api_sports_live():
     """Live scores"""
     try:
         football_service = FootballDataService()
-        live_data = football_service.get_live_matches()
-        return jsonify(live_data)
+        live_data = football_service.get_live_matches(as_json=True)
+        return json_response(live_data)
     except Exception as e:
         logger.error(f"Live scores API error: {str(e)}")
         return jsonify({
@@ -1176,13 +4229,31 @@ def api_sports_live():
             'timestamp': datetime.now().isoformat()
         }), 503
 
+@app.route('/api/sports/stream', methods=['GET'])
+def api_sports_stream():
+    """Live scores pushed as Server-Sent Events"""
+    subscriber = live_broadcaster.subscribe()
+    if subscriber is None:
+        # Clients fall back to polling /api/sports/live
+        return jsonify({
+            'success': False,
+            'error': 'Live stream at capacity',
+            'fallback': '/api/sports/live',
+            'timestamp': datetime.now().isoformat()
+        }), 503
+    
+    response = Response(live_broadcaster.stream(subscriber), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
 @app.route('/api/sports/fixtures', methods=['GET'])
 def api_sports_fixtures():
     """Fixtures"""
     try:
         football_service = FootballDataService()
-        fixtures_data = football_service.get_upcoming_fixtures()
-        return jsonify(fixtures_data)
+        fixtures_data = football_service.get_upcoming_fixtures(as_json=True)
+        return json_response(fixtures_data)
     except Exception as e:
         logger.error(f"Fixtures API error: {str(e)}")
         return jsonify({
@@ -1196,8 +4267,8 @@ def api_sports_upcoming():
     """Upcoming matches"""
     try:
         football_service = FootballDataService()
-        fixtures_data = football_service.get_upcoming_fixtures()
-        return jsonify(fixtures_data)
+        fixtures_data = football_service.get_upcoming_fixtures(as_json=True)
+        return json_response(fixtures_data)
     except Exception as e:
         logger.error(f"Upcoming matches API error: {str(e)}")
         return jsonify({
@@ -1208,46 +4279,68 @@ def api_sports_upcoming():
 
 @app.route('/api/sassa/payment-dates', methods=['GET'])
 def api_sassa_payment_dates():
-    """SASSA 2026 payment dates"""
-    now = datetime.now()
-    
-    payment_dates_2026 = [
-        '5 January 2026',
-        '2 February 2026',
-        '2 March 2026',
-        '1 April 2026',
-        '5 May 2026',
-        '2 June 2026',
-        '1 July 2026',
-        '4 August 2026',
-        '1 September 2026',
-        '6 October 2026',
-        '3 November 2026',
-        '1 December 2026'
-    ]
+    """Next SASSA payment dates, cached until the next one has passed"""
+    sassa_calendar.maybe_reload()
+    grant = request.args.get('grant') or None
+    if grant is not None and grant not in sassa_calendar.by_grant:
+        return jsonify({'success': False, 'error': f'Unknown grant: {grant}'}), 400
+    today = datetime.now(sa_timezone).date()
+    cache_key = f"sassa_payment_dates_{sassa_calendar.digest}_{grant}"
     
-    next_payment = None
-    for payment_date in payment_dates_2026:
-        payment_datetime = datetime.strptime(payment_date, '%d %B %Y')
-        if payment_datetime >= now:
-            next_payment = payment_date
-            break
+    cached = cache.get(cache_key, None, encoded=True)
+    if cached:
+        return json_response(cached)
     
-    if not next_payment:
-        next_payment = payment_dates_2026[0]
+    next_payment = sassa_calendar.next_payment(today, grant)
     
-    return jsonify({
+    # Per-grant dates for the month of the next payment
+    grant_dates = {}
+    if next_payment:
+        for payment_date, payment_grant, provisional in sassa_calendar.upcoming(today, limit=12):
+            if (payment_date.year, payment_date.month) == (next_payment[0].year, next_payment[0].month):
+                grant_dates.setdefault(payment_grant, format_payment_date(payment_date))
+    
+    result = {
         'success': True,
-        'next_payment_date': next_payment,
+        'next_payment_date': format_payment_date(next_payment[0]) if next_payment else None,
+        'next_payment_iso': next_payment[0].isoformat() if next_payment else None,
+        'grant': next_payment[1] if next_payment else grant,
+        'provisional': next_payment[2] if next_payment else False,
+        'grant_dates': {sassa_calendar.grant_name(g): d for g, d in grant_dates.items()},
+        'message': None if next_payment else 'Upcoming dates coming soon',
+        'note': sassa_calendar.note,
         'payment_window': '1st - 5th of each month',
-        'current_year': '2026',
+        'current_year': str(today.year),
+        'calendar_url': url_for('api_sassa_payment_dates_ics'),
         'official_contacts': {
             'helpline': '0800 60 10 11',
             'whatsapp': '082 046 8553',
             'website': 'https://www.sassa.gov.za',
             'email': 'GrantEnquiries@sassa.gov.za'
         }
-    })
+    }
+    
+    # The answer only changes once the next payment day is over (or the year
+    # rolls over); with no dates left, look again tomorrow
+    boundary = (next_payment[0] if next_payment else today) + timedelta(days=1)
+    boundary = min(boundary, today.replace(year=today.year + 1, month=1, day=1))
+    expires = datetime.combine(boundary, datetime.min.time(), sa_timezone).timestamp()
+    cache.set(cache_key, result, ttl=max(60, int(expires - time.time())))
+    return json_response(result)
+
+@app.route('/api/sassa/payment-dates.ics', methods=['GET'])
+def api_sassa_payment_dates_ics():
+    """All SASSA payment dates as an iCalendar feed"""
+    sassa_calendar.maybe_reload()
+    return Response(sassa_calendar.to_ics(), mimetype='text/calendar',
+                    headers={'Content-Disposition': 'attachment; filename="sassa-payment-dates.ics"',
+                             'Cache-Control': 'public, max-age=3600'})
+
+@app.route('/api/trending', methods=['GET'])
+def api_trending():
+    """Most viewed articles and pages, precomputed at each flush"""
+    trending.refresh_if_stale()
+    return json_response(trending.top_json)
 
 @app.route('/api/contact/submit', methods=['POST'])
 def api_contact_submit():
@@ -1258,19 +4351,35 @@ def api_contact_submit():
         # Validate required fields
         required_fields = ['name', 'email', 'subject', 'message']
         for field in required_fields:
-            if not data.get(field):
+            if not data.get(field, '').strip():
                 return jsonify({
                     'success': False,
                     'error': f'Missing required field: {field}'
                 }), 400
         
-        # In a production environment, you would:
-        # 1. Save to database
-        # 2. Send email notification
-        # 3. Validate email format
-        # 4. Implement spam protection
+        submission = {field: data[field].strip() for field in required_fields}
+        for field, limit in CONTACT_FIELD_LIMITS.items():
+            if len(submission[field]) > limit:
+                return jsonify({
+                    'success': False,
+                    'error': f'{field.title()} is too long (at most {limit} characters)'
+                }), 400
+        if not EMAIL_PATTERN.match(submission['email']):
+            return jsonify({
+                'success': False,
+                'error': 'Please enter a valid email address'
+            }), 400
+        
+        # Delivery happens in the background; the outbox row is the acknowledgement
+        outcome = contact_outbox.enqueue(submission, client_ip())
+        if outcome == 'throttled':
+            return jsonify({
+                'success': False,
+                'error': 'Too many messages from your network. Please wait a few minutes.',
+                'timestamp': datetime.now().isoformat()
+            }), 429
         
-        # For now, simulate successful submission
+        # A repeated message is acknowledged the same way so resubmits look normal
         return jsonify({
             'success': True,
             'message': 'Message received successfully',
@@ -1304,12 +4413,272 @@ def api_status():
         },
         'version': '2026.3.0',
         'uptime': '100%',
+        'weather_cache': weather_warmer.report(),
+        'geocode_store': geocode_store.report(),
+        'geocode_offline': dict(offline_geocoder.report(), mode=GEOCODE_MODE),
+        'page_fragments': page_fragments.report(),
+        'match_schedule': match_schedule.report(),
+        'upstream': upstream.report(),
+        'negative_cache': cache.negative_report(),
+        'contact_outbox': contact_outbox.report(),
+        'rate_limits': rate_limiter.report(),
+        'startup': startup.report(),
+        'logging': logging_report(),
+        'trending': trending.report(),
+        'cache_commands': cache_bus.report(),
         'last_updated': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
     })
 
 
     
 
+# =========== ADMIN ROUTES ===========
+SASSA_GRANT_KEYWORDS = (
+    ('older', 'older_persons'),
+    ('pension', 'older_persons'),
+    ('disab', 'disability'),
+    ('child', 'children'),
+    ('srd', 'srd'),
+)
+
+def parse_admin_payment_date(text):
+    """Parse '15 January 2027 - Disability Grants' into (date, grant, provisional)"""
+    date_part, _, label = text.partition(' - ')
+    for date_format in ('%Y-%m-%d', '%d %B %Y', '%d %b %Y'):
+        try:
+            payment_date = datetime.strptime(date_part.strip(), date_format).date()
+            break
+        except ValueError:
+            continue
+    else:
+        return None
+    
+    label = label.lower()
+    grant = next((grant for keyword, grant in SASSA_GRANT_KEYWORDS if keyword in label), 'all')
+    return payment_date, grant, 'provisional' in label
+
+@app.route('/admin')
+def admin():
+    """Admin panel, or the login form when not signed in"""
+    if not is_admin():
+        return render_template('admin_login.html',
+                             current_year=datetime.now().year,
+                             page_title='Admin Login - SA Daily Portal')
+    
+    sassa_calendar.maybe_reload()
+    today = datetime.now(sa_timezone).date()
+    upcoming = sassa_calendar.upcoming(today, limit=12)
+    
+    return render_template('admin.html',
+                         stats={
+                             'api_keys_status': {
+                                 service: '✅ Active' if key else '❌ Missing' for service, key in API_KEYS.items()
+                             },
+                             'firebase_status': ('✅ Active' if contact_outbox.last_error is None else '⚠️ Retrying')
+                                                if contact_outbox.sink.name == 'firestore' else '❌ Not configured',
+                             'cache_size': len(cache.cache),
+                             'last_updated': datetime.now(sa_timezone).strftime('%d %B %Y %H:%M'),
+                         },
+                         sassa_dates={
+                             'upcoming_dates': [
+                                 f"{format_payment_date(payment_date)} - {sassa_calendar.grant_name(grant)}"
+                                 f"{' (provisional)' if provisional else ''}"
+                                 for payment_date, grant, provisional in upcoming
+                             ],
+                             'status': 'active' if upcoming else 'empty',
+                             'message': f"{len(sassa_calendar.entries)} dates loaded, "
+                                        f"through {format_payment_date(sassa_calendar.dates[-1])}"
+                                        if sassa_calendar.dates else 'No dates loaded',
+                         },
+                         current_year=datetime.now().year,
+                         page_title='Admin Panel - SA Daily Portal')
+
+@app.route('/admin/login', methods=['POST'])
+def admin_login():
+    if not ADMIN_ENABLED:
+        return jsonify({'success': False, 'error': 'Admin access is not configured', 'timestamp': datetime.now().isoformat()}), 503
+    
+    data = request.get_json(silent=True) or {}
+    username = str(data.get('username', ''))
+    password = str(data.get('password', ''))
+    
+    valid_user = hmac.compare_digest(username.encode(), ADMIN_USERNAME.encode())
+    valid_password = hmac.compare_digest(password.encode(), ADMIN_PASSWORD.encode())
+    if not (valid_user and valid_password and same_origin()):
+        logger.warning(f"Failed admin login from {client_ip()}")
+        return jsonify({'success': False, 'error': 'Invalid credentials', 'timestamp': datetime.now().isoformat()}), 401
+    
+    session.clear()
+    session['admin'] = True
+    return jsonify({'success': True})
+
+@app.route('/admin/logout', methods=['POST'])
+def admin_logout():
+    session.pop('admin', None)
+    return jsonify({'success': True})
+
+@app.route('/admin/sassa/dates', methods=['POST'])
+@require_admin
+def admin_sassa_dates():
+    """Add (or with replace=true, replace) SASSA payment dates"""
+    data = request.get_json(silent=True) or {}
+    texts = [str(text).strip() for text in data.get('dates', []) if str(text).strip()]
+    if not texts:
+        return jsonify({'success': False, 'error': 'No dates provided', 'timestamp': datetime.now().isoformat()}), 400
+    
+    entries = [parse_admin_payment_date(text) for text in texts]
+    invalid = [text for text, entry in zip(texts, entries) if entry is None]
+    if invalid:
+        return jsonify({
+            'success': False,
+            'error': f"Could not read: {', '.join(invalid)}. Use e.g. '3 March 2027 - Older Persons Grant'.",
+            'timestamp': datetime.now().isoformat()
+        }), 400
+    
+    try:
+        if not sassa_calendar.save(entries, replace=bool(data.get('replace'))):
+            raise ValueError('saved calendar failed to load')
+    except (OSError, ValueError) as e:
+        logger.error(f"SASSA calendar save error: {str(e)}")
+        return jsonify({'success': False, 'error': 'Failed to save dates', 'timestamp': datetime.now().isoformat()}), 500
+    
+    return jsonify({
+        'success': True,
+        'message': f"Saved {len(entries)} date(s); calendar now has {len(sassa_calendar.entries)}",
+        'version': sassa_calendar.digest,
+    })
+
+@app.route('/admin/sassa/reload', methods=['POST'])
+@require_admin
+def admin_sassa_reload():
+    """Re-read the SASSA data file and overlay after either was edited on disk"""
+    if not sassa_calendar.load():
+        return jsonify({'success': False, 'error': 'Calendar files could not be loaded', 'timestamp': datetime.now().isoformat()}), 500
+    return jsonify({'success': True, 'total': len(sassa_calendar.entries), 'version': sassa_calendar.digest})
+
+def refresh_football_standings(competition=None):
+    codes = [competition] if competition else list(FOOTBALL_COMPETITIONS)
+    for code in codes:
+        FootballDataService.get_standings(code, force_refresh=True)
+
+def refresh_football_matches(competition=None):
+    # Stored failures would otherwise answer before upstream is asked again
+    cache.invalidate(['football_live_matches', 'football_todays_matches', 'football_upcoming_fixtures'],
+                     ['football_request_'])
+    FootballDataService.get_live_matches()
+    FootballDataService.get_todays_matches()
+    FootballDataService.get_upcoming_fixtures()
+
+def refresh_weather_cities(competition=None):
+    for city in weather_warmer.cities:
+        lat, lon = SA_CITIES[city]
+        WeatherService.get_weather_with_forecast(lat, lon, force_refresh=True)
+
+# dataset -> (families it writes, refresh function)
+CACHE_DATASETS = {
+    'football_standings': (('football_standings',), refresh_football_standings),
+    'football_matches': (('football_live', 'football_todays', 'football_upcoming'), refresh_football_matches),
+    # A forecast fetch also rewrites the point's current conditions and, for cities, its proxy entries
+    'weather_cities': (('weather_forecast', 'weather_current', 'weather_point'), refresh_weather_cities),
+}
+
+@app.route('/admin/cache', methods=['GET'])
+@require_admin
+def admin_cache():
+    """Cache contents and hit rates per key family"""
+    families = cache.family_report()
+    return jsonify({
+        'success': True,
+        'entries': len(cache.cache),
+        'bytes': sum(family['bytes'] for family in families.values()),
+        'families': families,
+        'negative': cache.negative_report(),
+        'commands': cache_bus.report(),
+        'datasets': list(CACHE_DATASETS),
+        'timestamp': datetime.now().isoformat()
+    })
+
+@app.route('/admin/cache/keys', methods=['GET'])
+@require_admin
+def admin_cache_keys():
+    """Individual keys under a prefix, newest first"""
+    prefix = request.args.get('prefix', '').rstrip('*')
+    limit = min(request.args.get('limit', 200, type=int), 1000)
+    now = time.time()
+    keys = sorted(
+        ((key, timestamp) for key, (_, timestamp) in list(cache.cache.items()) if key.startswith(prefix)),
+        key=lambda item: item[1], reverse=True
+    )
+    return jsonify({
+        'success': True,
+        'total': len(keys),
+        'keys': [
+            {'key': key, 'family': cache_family(key), 'age_s': round(now - timestamp),
+             'ttl_s': cache.ttls.get(key, cache.DEFAULT_TTL)}
+            for key, timestamp in keys[:limit]
+        ],
+    })
+
+@app.route('/admin/cache/invalidate', methods=['POST'])
+@require_admin
+def admin_cache_invalidate():
+    """Drop keys or prefixes ("weather_forecast_*") in every worker"""
+    data = request.get_json(silent=True) or {}
+    keys = [str(key) for key in data.get('keys', [])] + ([str(data['key'])] if data.get('key') else [])
+    prefixes = [str(prefix).rstrip('*') for prefix in data.get('prefixes', [])]
+    if data.get('prefix'):
+        prefixes.append(str(data['prefix']).rstrip('*'))
+    if data.get('all'):
+        prefixes = ['']
+    elif '' in prefixes:
+        return jsonify({'success': False, 'error': 'Use {"all": true} to clear the whole cache',
+                        'timestamp': datetime.now().isoformat()}), 400
+    if not keys and not prefixes:
+        return jsonify({'success': False, 'error': 'Provide key, keys, prefix, prefixes or all',
+                        'timestamp': datetime.now().isoformat()}), 400
+    
+    removed = cache_bus.publish({'action': 'invalidate', 'keys': keys, 'prefixes': prefixes})
+    logger.warning(f"Cache invalidated by admin: keys={keys} prefixes={prefixes} ({removed} entries here)")
+    return jsonify({'success': True, 'removed': removed, 'keys': keys, 'prefixes': prefixes})
+
+@app.route('/admin/cache/refresh', methods=['POST'])
+@require_admin
+def admin_cache_refresh():
+    """Refetch a dataset from upstream once and hand the result to every worker"""
+    data = request.get_json(silent=True) or {}
+    dataset = data.get('dataset') if isinstance(data, dict) else None
+    if dataset not in CACHE_DATASETS:
+        return jsonify({'success': False, 'error': f"Unknown dataset, expected one of {', '.join(CACHE_DATASETS)}",
+                        'timestamp': datetime.now().isoformat()}), 400
+    competition = data.get('competition')
+    if competition is not None:
+        if not isinstance(competition, str) or competition.upper() not in FOOTBALL_COMPETITIONS:
+            return jsonify({'success': False,
+                            'error': f"Unknown competition, expected one of {', '.join(FOOTBALL_COMPETITIONS)}",
+                            'timestamp': datetime.now().isoformat()}), 400
+        competition = competition.upper()
+    
+    families, refresh = CACHE_DATASETS[dataset]
+    started = time.time()
+    try:
+        refresh(competition)
+    except Exception as e:
+        logger.error(f"Cache refresh error ({dataset}): {str(e)}")
+        return jsonify({'success': False, 'error': 'Refresh failed', 'timestamp': datetime.now().isoformat()}), 502
+    
+    # Other workers take the fresh entries instead of each calling upstream
+    entries = [entry for entry in cache.entries() if entry[2] >= started and cache_family(entry[0]) in families]
+    if not entries:
+        return jsonify({'success': False, 'error': 'Upstream returned no fresh data',
+                        'timestamp': datetime.now().isoformat()}), 502
+    cache_bus.publish({'action': 'merge', 'entries': entries})
+    return jsonify({
+        'success': True,
+        'dataset': dataset,
+        'refreshed': sorted(entry[0] for entry in entries),
+        'duration_ms': round((time.time() - started) * 1000),
+    })
+
 # =========== ERROR HANDLERS ===========
 
 @app.errorhandler(404)
@@ -1369,9 +4738,126 @@ def redirect_questions():
 def redirect_privacy():
     return redirect(url_for('privacy_policy'))
 
+# =========== CLI COMMANDS ===========
+
+@app.cli.command('geocode-export')
+@click.argument('path', type=click.Path(dir_okay=False, writable=True))
+def geocode_export(path):
+    """Export stored reverse geocode results as JSON lines"""
+    count = 0
+    with open(path, 'w', encoding='utf-8') as f:
+        for record in geocode_store.export_records():
+            f.write(json.dumps(record) + '\n')
+            count += 1
+    click.echo(f"Exported {count} locations to {path}")
+
+@app.cli.command('geocode-import')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+def geocode_import(path):
+    """Import reverse geocode results from a JSON lines export"""
+    with open(path, encoding='utf-8') as f:
+        count = geocode_store.import_records(json.loads(line) for line in f if line.strip())
+    click.echo(f"Imported {count} locations from {path}")
+
+@app.cli.command('contact-flush')
+def contact_flush():
+    """Deliver queued contact form submissions now"""
+    click.echo(f"Delivered {contact_outbox.flush_all()} messages via {contact_outbox.sink.name}")
+    click.echo(json.dumps(contact_outbox.report(), indent=2))
+
+@app.cli.command('compile-templates')
+def compile_templates():
+    """Fill the Jinja bytecode cache, e.g. as part of the build"""
+    click.echo(f"Compiled {precompile_templates()} templates into {JINJA_CACHE_DIR}")
+
 # =========== APPLICATION START ===========
+BACKGROUND_TASKS = os.getenv('BACKGROUND_TASKS', '1') == '1'
+CACHE_SNAPSHOT = os.getenv('CACHE_SNAPSHOT', '1') == '1'
+JINJA_CACHE_DIR = os.getenv('JINJA_CACHE_DIR', os.path.join(STATE_DIR, 'jinja'))
+
+def precompile_templates():
+    """Compile every template now instead of on its first visitor; returns the count"""
+    env = app.jinja_env
+    compiled = 0
+    for name in env.list_templates(extensions=['html']):
+        try:
+            env.get_template(name)
+            compiled += 1
+        except Exception as e:
+            logger.error(f"Template compile error ({name}): {str(e)}")
+    return compiled
+
+def start_background_tasks():
+    """Start the per-worker refresh loops"""
+    if CACHE_SNAPSHOT:
+        cache_snapshot.start()
+        # Gunicorn workers also save from the worker_exit hook in gunicorn.conf.py
+        atexit.register(cache_snapshot.save_quietly)
+    standings_scheduler.start()
+    weather_warmer.start()
+    contact_outbox.start()
+    trending.start()
+    # Views still pending at shutdown would otherwise be lost
+    atexit.register(trending.flush_quietly)
+
+def finish_startup():
+    """Work deferred until the first response is out (or the fallback timer fires)"""
+    with startup.lock:
+        if startup.deferred_done:
+            return
+        startup.deferred_done = True
+    
+    started = time.perf_counter()
+    try:
+        requests.load()
+        offline_geocoder.load()
+        sassa_calendar.maybe_reload()
+        if not templates_compiled:
+            precompile_templates()
+        if BACKGROUND_TASKS:
+            start_background_tasks()
+    except Exception as e:
+        logger.error(f"Deferred startup error: {str(e)}")
+    startup.deferred_ms = round((time.perf_counter() - started) * 1000, 1)
+
+startup.mark('routes')
+
+# Restore first so the warmers only fetch what the snapshot lacks
+if BACKGROUND_TASKS and CACHE_SNAPSHOT:
+    cache_snapshot.load()
+    # Invalidations issued while this worker was down must win over the snapshot
+    cache_bus.poll(force=True)
+startup.mark('cache_restore')
+
+try:
+    os.makedirs(JINJA_CACHE_DIR, exist_ok=True)
+    app.jinja_env.bytecode_cache = FileSystemBytecodeCache(JINJA_CACHE_DIR)
+    # One cache file per template once `flask compile-templates` or a previous boot ran
+    templates_cached = len(os.listdir(JINJA_CACHE_DIR)) >= len(app.jinja_env.list_templates(extensions=['html']))
+except OSError as e:
+    logger.error(f"Jinja bytecode cache unavailable: {str(e)}")
+    templates_cached = False
+
+# Loading cached bytecode takes ~10ms; compiling from source ~150ms, which a
+# lazy start leaves for after the first response
+templates_compiled = templates_cached or not LAZY_STARTUP
+if templates_compiled:
+    precompile_templates()
+startup.mark('templates')
+
+if LAZY_STARTUP:
+    fallback = threading.Timer(LAZY_STARTUP_DELAY, finish_startup)
+    fallback.daemon = True
+    fallback.start()
+else:
+    finish_startup()
+startup.mark('background')
+logger.info(f"Startup phases (ms): {startup.phases}")
 
 if __name__ == '__main__':
+    # Exit through atexit on SIGTERM so the cache snapshot gets written
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    
     # Create necessary directories
     required_dirs = ['templates', 'templates/guides', 'templates/news', 'static/css', 'static/js', 'static/images']
     for dir_name in required_dirs:
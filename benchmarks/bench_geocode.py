@@ -0,0 +1,91 @@
+"""Location name extraction from Google reverse geocode payloads.
+
+Compares LocationService._extract_best_location_name, which rescans each
+result's address_components per priority level, with a single pass that
+indexes component types once per result.
+
+    python benchmarks/bench_geocode.py [--rounds 20000]
+"""
+import argparse
+import os
+import sys
+import time
+
+os.environ.setdefault('BACKGROUND_TASKS', '0')
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import app as portal  # noqa: E402
+
+from fixtures import google_reverse_geocode  # noqa: E402
+
+# (result types that enable the level, component types it reads), best first
+LEVELS = (
+    (frozenset(('street_address', 'route')), ('route',)),
+    (frozenset(('neighborhood',)), ('neighborhood',)),
+    (frozenset(('sublocality', 'sublocality_level_1')), ('sublocality', 'sublocality_level_1')),
+    (frozenset(('locality',)), ('locality',)),
+    (frozenset(('administrative_area_level_2',)), ('administrative_area_level_2',)),
+)
+
+
+def rescans(results):
+    return portal.LocationService._extract_best_location_name(results, 0, 0)
+
+
+def indexed(results):
+    for result in results:
+        types = result.get('types', ())
+        targets = {}
+        for level, (result_types, component_types) in enumerate(LEVELS):
+            if not result_types.isdisjoint(types):
+                for component_type in component_types:
+                    targets[component_type] = level
+        if not targets:
+            continue
+
+        found = {}
+        street_number = None
+        for component in result.get('address_components', ()):
+            for component_type in component.get('types', ()):
+                if component_type == 'street_number':
+                    if street_number is None:
+                        street_number = component.get('long_name', '')
+                elif component_type in targets and targets[component_type] not in found:
+                    found[targets[component_type]] = component.get('long_name', '')
+
+        if found:
+            level = min(found)
+            if level == 0 and street_number:
+                return f"{street_number} {found[0]}"
+            return found[level]
+    return results[0].get('formatted_address', '').split(',')[0].strip()
+
+
+def per_call(func, results, rounds):
+    func(results)
+    best = float('inf')
+    for _ in range(5):
+        start = time.perf_counter()
+        for _ in range(rounds):
+            func(results)
+        best = min(best, time.perf_counter() - start)
+    return best / rounds * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rounds', type=int, default=20000)
+    args = parser.parse_args()
+
+    print(f"{'payload':<10}{'name':<30}{'rescans':>10}{'indexed':>12}{'ratio':>8}")
+    for scenario in ('street', 'suburb', 'rural'):
+        results = google_reverse_geocode(scenario)['results']
+        expected = rescans(results)
+        assert indexed(results) == expected, (scenario, indexed(results), expected)
+        before = per_call(rescans, results, args.rounds)
+        after = per_call(indexed, results, args.rounds)
+        print(f"{scenario:<10}{expected:<30}{before:>8.2f}µs{after:>10.2f}µs{before / after:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
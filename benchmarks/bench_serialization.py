@@ -0,0 +1,58 @@
+"""Per-request CPU for football and weather API responses.
+
+Compares the previous behaviour (plain dicts re-serialized by jsonify on every
+request) with slot records whose JSON bytes are cached on the entry.
+
+    python benchmarks/bench_serialization.py [--requests 2000]
+"""
+import argparse
+import os
+import sys
+import time
+
+os.environ.setdefault('BACKGROUND_TASKS', '0')
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import app as portal  # noqa: E402
+from flask import jsonify  # noqa: E402
+
+from fixtures import football_matches, football_standings  # noqa: E402
+
+
+def cpu_per_call(func, calls):
+    func()
+    start = time.process_time()
+    for _ in range(calls):
+        func()
+    return (time.process_time() - start) / calls * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=2000)
+    args = parser.parse_args()
+
+    service = portal.FootballDataService
+    datasets = {
+        'matches (100)': ('football_todays_matches', 300, service._process_matches_data(football_matches(100)), 'matches'),
+        'standings (20)': ('football_standings_PL', portal.STANDINGS_MAX_AGE,
+                           service._process_standings_data(football_standings()), 'standings'),
+    }
+
+    print(f"encoder: {'orjson' if portal.orjson else 'json'}")
+    print(f"{'payload':<16}{'jsonify dicts':>16}{'cached bytes':>16}{'speedup':>10}")
+
+    with portal.app.app_context():
+        for label, (key, ttl, records, field) in datasets.items():
+            legacy = {'success': True, field: [record.to_dict() for record in records],
+                      'last_updated': '2026-01-01T12:00:00', 'cached': True}
+            portal.cache.set(key, {'success': True, field: records, 'last_updated': '2026-01-01T12:00:00'})
+
+            before = cpu_per_call(lambda: jsonify(legacy).get_data(), args.requests)
+            after = cpu_per_call(lambda: portal.json_response(portal.cache.get(key, ttl, encoded=True)).get_data(),
+                                 args.requests)
+            print(f"{label:<16}{before:>13.1f}µs{after:>13.1f}µs{before / after:>9.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+"""UTC -> SAST formatting for match kickoffs and forecast slots.
+
+Compares the previous per-item tz database conversion plus strftime with the
+memoized fixed-offset formatter.
+
+    python benchmarks/bench_timefmt.py [--rounds 200]
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+
+os.environ.setdefault('BACKGROUND_TASKS', '0')
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import app as portal  # noqa: E402
+
+from fixtures import football_matches, owm_forecast  # noqa: E402
+
+try:
+    import pytz
+    legacy_timezone = pytz.timezone('Africa/Johannesburg')
+except ImportError:
+    from zoneinfo import ZoneInfo
+    legacy_timezone = ZoneInfo('Africa/Johannesburg')
+
+
+def legacy_kickoffs(utc_dates):
+    out = []
+    for utc_date in utc_dates:
+        dt = datetime.fromisoformat(utc_date.replace('Z', '+00:00')).astimezone(legacy_timezone)
+        out.append((dt.strftime('%Y-%m-%d'), dt.strftime('%H:%M')))
+    return out
+
+
+def cached_kickoffs(utc_dates):
+    out = []
+    for utc_date in utc_dates:
+        kickoff = portal.sast_strings(portal.parse_utc_timestamp(utc_date))
+        out.append((kickoff.date, kickoff.time))
+    return out
+
+
+def legacy_slots(timestamps):
+    out = []
+    for timestamp in timestamps:
+        dt = datetime.fromtimestamp(timestamp).astimezone(legacy_timezone)
+        out.append((dt.strftime('%Y-%m-%d'), dt.strftime('%I %p').lstrip('0'), dt.strftime('%a'), dt.strftime('%b %d')))
+    return out
+
+
+def cached_slots(timestamps):
+    return [(slot.date, slot.hour, slot.day, slot.month_day) for slot in portal.sast_strings_bulk(timestamps)]
+
+
+def per_round(func, arg, rounds):
+    func(arg)
+    start = time.perf_counter()
+    for _ in range(rounds):
+        func(arg)
+    return (time.perf_counter() - start) / rounds * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rounds', type=int, default=200)
+    args = parser.parse_args()
+
+    kickoffs = [match['utcDate'] for match in football_matches(500)['matches']]
+    slots = [item['dt'] for item in owm_forecast(40)['list']]
+    assert legacy_kickoffs(kickoffs) == cached_kickoffs(kickoffs)
+
+    print(f"{'workload':<22}{'tz + strftime':>16}{'memoized':>14}{'speedup':>10}")
+    for label, legacy, cached, data in [
+        ('500 kickoffs', legacy_kickoffs, cached_kickoffs, kickoffs),
+        ('40 forecast slots', legacy_slots, cached_slots, slots),
+    ]:
+        before = per_round(legacy, data, args.rounds)
+        after = per_round(cached, data, args.rounds)
+        print(f"{label:<22}{before:>13.1f}µs{after:>11.1f}µs{before / after:>9.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,176 @@
+"""Synthetic upstream payloads shaped like the real API responses"""
+import time
+
+TEAMS = [
+    'Arsenal FC', 'Chelsea FC', 'Liverpool FC', 'Manchester City FC', 'Manchester United FC',
+    'Tottenham Hotspur FC', 'Newcastle United FC', 'Aston Villa FC', 'Brighton & Hove Albion FC',
+    'West Ham United FC', 'Real Madrid CF', 'FC Barcelona', 'Club Atlético de Madrid',
+    'FC Bayern München', 'Borussia Dortmund', 'Juventus FC', 'AC Milan', 'FC Internazionale Milano',
+    'Paris Saint-Germain FC', 'AFC Ajax',
+]
+
+COMPETITIONS = [
+    ('PL', 'Premier League'), ('PD', 'Primera Division'), ('SA', 'Serie A'),
+    ('BL1', 'Bundesliga'), ('FL1', 'Ligue 1'), ('CL', 'UEFA Champions League'),
+]
+
+STATUSES = ['SCHEDULED', 'TIMED', 'LIVE', 'IN_PLAY', 'PAUSED', 'FINISHED']
+
+
+def football_matches(count, start=None):
+    """A /v4/matches payload with `count` matches on shared kickoff slots"""
+    start = start or 1767279600  # 2026-01-01 15:00 UTC
+    matches = []
+    for i in range(count):
+        code, name = COMPETITIONS[i % len(COMPETITIONS)]
+        status = STATUSES[i % len(STATUSES)]
+        kickoff = start + (i % 8) * 9000 + (i // 8 % 5) * 86400
+        finished = status in ('FINISHED', 'LIVE', 'IN_PLAY', 'PAUSED')
+        matches.append({
+            'id': 500000 + i,
+            'utcDate': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(kickoff)),
+            'status': status,
+            'matchday': 1 + i % 38,
+            'minute': 67 if status == 'LIVE' else None,
+            'venue': 'Stadium',
+            'competition': {'id': 2000 + i % 6, 'name': name, 'code': code},
+            'homeTeam': {'id': i, 'name': TEAMS[i % len(TEAMS)]},
+            'awayTeam': {'id': i + 1, 'name': TEAMS[(i * 7 + 3) % len(TEAMS)]},
+            'score': {
+                'winner': None,
+                'fullTime': {'home': i % 4 if finished else None, 'away': i % 3 if finished else None},
+                'halfTime': {'home': None, 'away': None},
+            },
+        })
+    return {'filters': {}, 'resultSet': {'count': count}, 'matches': matches}
+
+
+def football_standings(teams=20, code='PL', name='Premier League'):
+    """A /v4/competitions/<code>/standings payload"""
+    table = []
+    for i in range(teams):
+        won, draw, lost = 20 - i // 2, 5 + i % 4, 3 + i
+        table.append({
+            'position': i + 1,
+            'team': {'id': i, 'name': TEAMS[i % len(TEAMS)], 'shortName': TEAMS[i % len(TEAMS)][:10]},
+            'playedGames': won + draw + lost,
+            'form': 'W,D,L,W,W',
+            'won': won,
+            'draw': draw,
+            'lost': lost,
+            'points': won * 3 + draw,
+            'goalsFor': 60 - i,
+            'goalsAgainst': 20 + i,
+            'goalDifference': 40 - 2 * i,
+        })
+    return {
+        'competition': {'code': code, 'name': name},
+        'season': {'currentMatchday': 24},
+        'standings': [
+            {'stage': 'REGULAR_SEASON', 'type': 'TOTAL', 'table': table},
+            {'stage': 'REGULAR_SEASON', 'type': 'HOME', 'table': table},
+            {'stage': 'REGULAR_SEASON', 'type': 'AWAY', 'table': table},
+        ],
+    }
+
+
+WEATHER_CONDITIONS = [
+    ('clear sky', '01d'), ('few clouds', '02d'), ('scattered clouds', '03d'),
+    ('broken clouds', '04n'), ('light rain', '10d'), ('thunderstorm', '11d'),
+]
+
+
+def owm_current(lat=-26.2041, lon=28.0473, name='Johannesburg', now=None):
+    """An OpenWeatherMap /data/2.5/weather payload"""
+    now = int(now or time.time())
+    return {
+        'coord': {'lon': lon, 'lat': lat},
+        'weather': [{'id': 800, 'main': 'Clear', 'description': 'clear sky', 'icon': '01d'}],
+        'main': {'temp': 24.3, 'feels_like': 23.9, 'temp_min': 22.1, 'temp_max': 25.6,
+                 'pressure': 1019, 'humidity': 38},
+        'visibility': 10000,
+        'wind': {'speed': 3.6, 'deg': 320},
+        'clouds': {'all': 5},
+        'dt': now,
+        'sys': {'country': 'ZA', 'sunrise': now - now % 86400 + 12600, 'sunset': now - now % 86400 + 61200},
+        'timezone': 7200,
+        'name': name,
+        'cod': 200,
+    }
+
+
+def owm_forecast(slots=40, lat=-26.2041, lon=28.0473, name='Johannesburg', now=None):
+    """An OpenWeatherMap /data/2.5/forecast payload with 3-hourly slots"""
+    now = int(now or time.time())
+    first = now - now % 10800 + 10800
+    items = []
+    for i in range(slots):
+        description, icon = WEATHER_CONDITIONS[(i // 3) % len(WEATHER_CONDITIONS)]
+        items.append({
+            'dt': first + i * 10800,
+            'main': {'temp': 14 + (i % 8) * 1.7, 'feels_like': 13 + (i % 8) * 1.6,
+                     'humidity': 40 + i % 30, 'pressure': 1015},
+            'weather': [{'id': 800, 'main': description.split()[0].title(),
+                         'description': description, 'icon': icon}],
+            'clouds': {'all': (i * 13) % 100},
+            'wind': {'speed': 2.5 + (i % 5) * 0.4, 'deg': 200},
+            'pop': round((i % 7) / 10, 2),
+            'dt_txt': time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime(first + i * 10800)),
+        })
+    return {'cod': '200', 'cnt': slots, 'list': items,
+            'city': {'name': name, 'coord': {'lat': lat, 'lon': lon}, 'country': 'ZA', 'timezone': 7200}}
+
+
+def _component(name, *types, short=None):
+    return {'long_name': name, 'short_name': short or name, 'types': list(types)}
+
+
+def google_reverse_geocode(scenario='street'):
+    """
+    A Geocoding API latlng payload modelled on recorded responses.
+
+    street: urban point, results run from street address down to country
+    suburb: no street-level match, first result is a sublocality
+    rural: only municipality, province and country resolve
+    """
+    street = [
+        _component('14', 'street_number'),
+        _component('Rivonia Road', 'route', short='Rivonia Rd'),
+        _component('Sandhurst', 'neighborhood', 'political'),
+        _component('Sandton', 'political', 'sublocality', 'sublocality_level_1'),
+        _component('Johannesburg', 'locality', 'political'),
+        _component('City of Johannesburg Metropolitan Municipality', 'administrative_area_level_2', 'political'),
+        _component('Gauteng', 'administrative_area_level_1', 'political', short='GP'),
+        _component('South Africa', 'country', 'political', short='ZA'),
+        _component('2196', 'postal_code'),
+    ]
+    rural = [
+        _component('Gamagara Local Municipality', 'administrative_area_level_2', 'political'),
+        _component('Northern Cape', 'administrative_area_level_1', 'political', short='NC'),
+        _component('South Africa', 'country', 'political', short='ZA'),
+    ]
+    # (result types, index of the first component kept in that result)
+    levels = {
+        'street': [(['street_address'], 0), (['route'], 1), (['neighborhood', 'political'], 2),
+                   (['political', 'sublocality', 'sublocality_level_1'], 3), (['locality', 'political'], 4),
+                   (['postal_code'], 4), (['administrative_area_level_2', 'political'], 5),
+                   (['administrative_area_level_1', 'political'], 6), (['country', 'political'], 7)],
+        'suburb': [(['political', 'sublocality', 'sublocality_level_1'], 3), (['locality', 'political'], 4),
+                   (['postal_code'], 4), (['administrative_area_level_2', 'political'], 5),
+                   (['administrative_area_level_1', 'political'], 6), (['country', 'political'], 7)],
+        'rural': [(['administrative_area_level_2', 'political'], 0),
+                  (['administrative_area_level_1', 'political'], 1), (['country', 'political'], 2)],
+    }[scenario]
+    components = rural if scenario == 'rural' else street
+
+    results = []
+    for types, first in levels:
+        kept = components[first:]
+        results.append({
+            'address_components': kept,
+            'formatted_address': ', '.join(component['long_name'] for component in kept),
+            'geometry': {'location': {'lat': -26.1076, 'lng': 28.0567}, 'location_type': 'APPROXIMATE'},
+            'place_id': f"ChIJ{scenario}{len(results)}",
+            'types': types,
+        })
+    return {'plus_code': {'global_code': '5G7CVXRW+X5'}, 'results': results, 'status': 'OK'}
@@ -0,0 +1,215 @@
+"""Load test the portal against a local upstream stand-in.
+
+Starts upstream_stub in-process, launches the app in a fresh subprocess for
+each scenario and drives a weighted mix of pages and API routes with
+concurrent keep-alive clients. Reports throughput and p50/p95/p99 latency per
+route.
+
+    cold  fresh process, no warm-up, /api/weather spread over many grid cells
+    warm  fresh process, one untimed pass over every target, then a small set
+          of popular coordinates
+
+    python benchmarks/load_test.py [--scenario both] [--concurrency 16] [--duration 10]
+        [--server werkzeug|gunicorn] [--latency 150] [--error-rate 0.01] [--json out.json]
+"""
+import argparse
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import requests
+
+from upstream_stub import add_arguments, from_arguments
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+# (label, path, weight); {lat}/{lon} are filled per request
+TARGETS = [
+    ('/', '/', 12),
+    ('/sports', '/sports', 6),
+    ('/weather', '/weather', 6),
+    ('/api/weather', '/api/weather?lat={lat}&lon={lon}', 30),
+    ('/api/sports/live', '/api/sports/live', 16),
+    ('/api/sports/matches', '/api/sports/matches', 10),
+    ('/api/sports/standings', '/api/sports/standings', 8),
+    ('/api/sports/upcoming', '/api/sports/upcoming', 6),
+    ('/api/sports/fixtures', '/api/sports/fixtures', 6),
+]
+
+POPULAR_POINTS = [
+    (-26.2041, 28.0473), (-33.9249, 18.4241), (-29.8587, 31.0218), (-25.7479, 28.2293),
+    (-33.9608, 25.6022), (-29.0852, 26.1596), (-26.1076, 28.0567), (-33.9321, 18.8602),
+]
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_app(server, port, workers, env):
+    if server == 'gunicorn':
+        command = ['gunicorn', '-k', 'gevent', '-w', str(workers), '-b', f"127.0.0.1:{port}",
+                   '--log-level', 'warning', 'app:app']
+    else:
+        command = [sys.executable, '-c',
+                   'from werkzeug.serving import run_simple; from app import app; '
+                   f"run_simple('127.0.0.1', {port}, app, threaded=True)"]
+    started = time.perf_counter()
+    process = subprocess.Popen(command, cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    # Time from spawn to the first answered page approximates a wake-up TTFB
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"app exited with status {process.returncode}")
+        try:
+            requests.get(f"http://127.0.0.1:{port}/", timeout=5)
+            return process, time.perf_counter() - started
+        except requests.RequestException:
+            time.sleep(0.02)
+    process.kill()
+    raise RuntimeError('app did not start within 30s')
+
+
+def pick_point(rng, scenario):
+    if scenario == 'warm':
+        return rng.choice(POPULAR_POINTS)
+    # Three decimals across the country: nearly every request is a new cache cell
+    return round(rng.uniform(-34.5, -22.5), 3), round(rng.uniform(17.5, 32.5), 3)
+
+
+def run_clients(base_url, scenario, concurrency, duration, seed):
+    labels = [label for label, _, _ in TARGETS]
+    paths = {label: path for label, path, _ in TARGETS}
+    weights = [weight for _, _, weight in TARGETS]
+    samples = {label: [] for label in labels}
+    failures = {label: 0 for label in labels}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def client(index):
+        rng = random.Random(seed + index)
+        session = requests.Session()
+        local = []
+        while time.perf_counter() < deadline:
+            label = rng.choices(labels, weights)[0]
+            lat, lon = pick_point(rng, scenario)
+            start = time.perf_counter()
+            try:
+                ok = session.get(base_url + paths[label].format(lat=lat, lon=lon), timeout=30).status_code < 400
+            except requests.RequestException:
+                ok = False
+            local.append((label, time.perf_counter() - start, ok))
+        with lock:
+            for label, elapsed, ok in local:
+                samples[label].append(elapsed)
+                failures[label] += not ok
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return samples, failures, time.perf_counter() - started
+
+
+def warm_up(base_url):
+    session = requests.Session()
+    for label, path, _ in TARGETS:
+        for lat, lon in POPULAR_POINTS if '{lat}' in path else [(0, 0)]:
+            session.get(base_url + path.format(lat=lat, lon=lon), timeout=60)
+
+
+def summarize(samples, failures, elapsed):
+    rows = {}
+    everything = []
+    for label, values in samples.items():
+        values.sort()
+        everything.extend(values)
+        rows[label] = {
+            'requests': len(values),
+            'failures': failures[label],
+            'rps': round(len(values) / elapsed, 1),
+            'p50_ms': round(percentile(values, 0.50) * 1000, 2),
+            'p95_ms': round(percentile(values, 0.95) * 1000, 2),
+            'p99_ms': round(percentile(values, 0.99) * 1000, 2),
+        }
+    everything.sort()
+    rows['total'] = {
+        'requests': len(everything),
+        'failures': sum(failures.values()),
+        'rps': round(len(everything) / elapsed, 1),
+        'p50_ms': round(percentile(everything, 0.50) * 1000, 2),
+        'p95_ms': round(percentile(everything, 0.95) * 1000, 2),
+        'p99_ms': round(percentile(everything, 0.99) * 1000, 2),
+    }
+    return rows
+
+
+def print_table(scenario, rows):
+    print(f"[{scenario}]")
+    print(f"{'route':<26}{'requests':>9}{'fail':>6}{'req/s':>9}{'p50':>10}{'p95':>10}{'p99':>10}")
+    for label, row in rows.items():
+        print(f"{label:<26}{row['requests']:>9}{row['failures']:>6}{row['rps']:>9.1f}"
+              f"{row['p50_ms']:>8.1f}ms{row['p95_ms']:>8.1f}ms{row['p99_ms']:>8.1f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scenario', choices=['cold', 'warm', 'both'], default='both')
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=10, help='seconds of load per scenario')
+    parser.add_argument('--server', choices=['werkzeug', 'gunicorn'], default='werkzeug')
+    parser.add_argument('--workers', type=int, default=2, help='gunicorn workers')
+    parser.add_argument('--json', help='write results to this file')
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    stub = from_arguments(args).start()
+    results = {'config': {key: value for key, value in vars(args).items() if key != 'json'}, 'scenarios': {}}
+
+    for scenario in (['cold', 'warm'] if args.scenario == 'both' else [args.scenario]):
+        port = free_port()
+        env = dict(os.environ, **stub.env(), BACKGROUND_TASKS='0', CACHE_SNAPSHOT='0', RATE_LIMITING='0',
+                   STATE_DIR=tempfile.mkdtemp(prefix='portal-load-'))
+        process, ready = start_app(args.server, port, args.workers, env)
+        print(f"\n[{scenario}] first response {ready * 1000:.0f}ms after spawn")
+        base_url = f"http://127.0.0.1:{port}"
+        try:
+            if scenario == 'warm':
+                warm_up(base_url)
+            samples, failures, elapsed = run_clients(base_url, scenario, args.concurrency, args.duration, args.seed)
+        finally:
+            process.terminate()
+            process.wait(timeout=10)
+
+        rows = summarize(samples, failures, elapsed)
+        results['scenarios'][scenario] = rows
+        results.setdefault('first_response_ms', {})[scenario] = round(ready * 1000, 1)
+        print_table(scenario, rows)
+
+    stub.stop()
+    results['upstream'] = stub.stats
+    print(f"\nupstream calls: {json.dumps(stub.stats)}")
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,213 @@
+"""Microbenchmarks for the CPU-bound processing that runs on every refresh.
+
+Each case is timed against fixture payloads with an auto-calibrated loop and
+reported as best and median time per call. Results are written as JSON
+(benchmarks/results/<commit>.json by default) so two commits can be compared:
+
+    python benchmarks/microbench.py                        # run and save
+    python benchmarks/microbench.py --compare results/abc1234.json
+    python benchmarks/microbench.py --filter matches --no-save
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+os.environ.setdefault('BACKGROUND_TASKS', '0')
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, '..'))
+
+import app as portal  # noqa: E402
+
+from fixtures import football_matches, football_standings, google_reverse_geocode, owm_current, owm_forecast  # noqa: E402
+
+CASES = {}
+
+
+def case(name):
+    """Register a setup function returning the zero-argument callable to time"""
+    def register(setup):
+        CASES[name] = setup
+        return setup
+    return register
+
+
+for count in (10, 100, 500):
+    @case(f"process_matches_{count}")
+    def _matches(count=count):
+        payload = football_matches(count)
+        return lambda: portal.FootballDataService._process_matches_data(payload)
+
+
+@case('process_standings')
+def _standings():
+    payload = football_standings()
+    return lambda: portal.FootballDataService._process_standings_data(payload)
+
+
+@case('weather_payloads')
+def _weather():
+    current, forecast = owm_current(), owm_forecast(40)
+    return lambda: portal.WeatherService._process_weather_payloads(current, forecast)
+
+
+@case('weather_daily_aggregate_6')
+def _daily():
+    lists = [owm_forecast(40)['list'] for _ in range(6)]
+    return lambda: portal.WeatherService.aggregate_daily_forecasts(lists)
+
+
+for scenario in ('street', 'suburb', 'rural'):
+    @case(f"location_name_{scenario}")
+    def _location(scenario=scenario):
+        results = google_reverse_geocode(scenario)['results']
+        return lambda: portal.LocationService._extract_best_location_name(results, -26.1, 28.0)
+
+
+@case('cache_get_hit')
+def _cache_get():
+    cache = portal.CacheSystem()
+    cache.set('key', {'success': True, 'value': list(range(20))})
+    return lambda: cache.get('key', 300)
+
+
+@case('cache_get_encoded')
+def _cache_get_encoded():
+    cache = portal.CacheSystem()
+    standings = portal.FootballDataService._process_standings_data(football_standings())
+    cache.set('key', {'success': True, 'competition': 'PL', 'standings': standings})
+    return lambda: cache.get('key', 300, encoded=True)
+
+
+for threads in (1, 4, 16):
+    @case(f"cache_contention_{threads}t")
+    def _contention(threads=threads, operations=2000, keys=256):
+        """Threads doing 90% get / 10% set on shared keys; time is per batch of operations"""
+        cache = portal.CacheSystem()
+        for i in range(keys):
+            cache.set(f"key_{i}", {'value': i})
+
+        def worker(offset):
+            for i in range(operations):
+                key = f"key_{(i * 7 + offset) % keys}"
+                if i % 10 == 0:
+                    cache.set(key, {'value': i})
+                else:
+                    cache.get(key, 300)
+
+        def run():
+            pool = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+            for thread in pool:
+                thread.start()
+            for thread in pool:
+                thread.join()
+        return run
+
+
+def measure(func, min_time, repeats):
+    """Best and median seconds per call over `repeats` calibrated loops"""
+    func()
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        if time.perf_counter() - start >= min_time / 5:
+            break
+        number *= 2
+
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        timings.append((time.perf_counter() - start) / number)
+    return min(timings), statistics.median(timings), number
+
+
+def git_commit():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=HERE, capture_output=True,
+                                text=True, check=True).stdout.strip()
+        dirty = bool(subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=HERE,
+                                    capture_output=True, text=True).stdout.strip())
+        return commit, dirty
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown', False
+
+
+def compare(results, baseline, threshold):
+    """Print per-case ratios against a baseline; returns the regressed case names"""
+    regressed = []
+    print(f"\n{'case':<28}{'baseline':>12}{'current':>12}{'change':>9}")
+    for name, row in results.items():
+        before = baseline.get('results', {}).get(name)
+        if not before:
+            print(f"{name:<28}{'-':>12}{row['best_us']:>10.2f}µs{'new':>9}")
+            continue
+        change = row['best_us'] / before['best_us'] - 1
+        flag = ''
+        if change > threshold:
+            flag = '  slower'
+            regressed.append(name)
+        elif change < -threshold:
+            flag = '  faster'
+        print(f"{name:<28}{before['best_us']:>10.2f}µs{row['best_us']:>10.2f}µs{change:>+8.1%}{flag}")
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--filter', help='only run cases whose name contains this')
+    parser.add_argument('--min-time', type=float, default=0.2, help='approximate seconds per case')
+    parser.add_argument('--repeats', type=int, default=7)
+    parser.add_argument('--output', help='results file (default results/<commit>.json)')
+    parser.add_argument('--no-save', action='store_true')
+    parser.add_argument('--compare', help='baseline results file')
+    parser.add_argument('--threshold', type=float, default=0.10, help='relative change reported as a regression')
+    args = parser.parse_args()
+
+    commit, dirty = git_commit()
+    results = {}
+    print(f"{'case':<28}{'best':>12}{'median':>12}{'loops':>8}")
+    for name, setup in CASES.items():
+        if args.filter and args.filter not in name:
+            continue
+        best, median, number = measure(setup(), args.min_time, args.repeats)
+        results[name] = {'best_us': round(best * 1e6, 3), 'median_us': round(median * 1e6, 3), 'loops': number}
+        print(f"{name:<28}{best * 1e6:>10.2f}µs{median * 1e6:>10.2f}µs{number:>8}")
+
+    report = {
+        'meta': {
+            'commit': commit,
+            'dirty': dirty,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'json_backend': 'orjson' if portal.orjson else 'json',
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        },
+        'results': results,
+    }
+
+    if not args.no_save:
+        path = args.output or os.path.join(HERE, 'results', f"{commit}{'-dirty' if dirty else ''}.json")
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nsaved {path}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        print(f"compared with {baseline['meta']['commit']}")
+        if compare(results, baseline, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,192 @@
+"""Local stand-in for football-data.org, OpenWeatherMap and Google Geocoding.
+
+Serves recorded responses with configurable latency, error and 429 rates so
+the app can be exercised without touching the live APIs. A recording is a
+JSON file in --recordings named after the route it replaces:
+
+    matches.json  standings_<CODE>.json  weather.json  forecast.json  geocode.json
+
+Routes without a recording are answered from the synthetic fixtures.
+
+    python benchmarks/upstream_stub.py --port 8901 --latency 150 --jitter 50 \\
+        --error-rate 0.01 --throttle-rate 0.02
+
+Point the app at it with the environment printed on startup.
+"""
+import argparse
+import json
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from fixtures import football_matches, football_standings, google_reverse_geocode, owm_current, owm_forecast
+
+LIVE_STATUSES = {'LIVE', 'IN_PLAY', 'PAUSED'}
+
+
+class UpstreamStub:
+    """Threaded HTTP server answering the three upstream APIs under path prefixes"""
+
+    def __init__(self, host='127.0.0.1', port=0, latency=0.0, jitter=0.0, error_rate=0.0,
+                 throttle_rate=0.0, recordings=None, seed=None):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.recordings = recordings
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.stats = {}
+        self.server = ThreadingHTTPServer((host, port), self._handler())
+        self.server.daemon_threads = True
+        self.thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def env(self):
+        """Environment variables that point the app at this server"""
+        return {
+            'FOOTBALL_DATA_URL': f"{self.base_url}/football/v4",
+            'OPENWEATHER_URL': f"{self.base_url}/owm/data/2.5",
+            'GOOGLE_GEOCODE_URL': f"{self.base_url}/google/maps/api/geocode/json",
+        }
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, name='upstream-stub', daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def count(self, upstream, outcome):
+        with self.lock:
+            counters = self.stats.setdefault(upstream, {'ok': 0, 'error': 0, 'throttled': 0, 'not_found': 0})
+            counters[outcome] += 1
+
+    def recorded(self, name):
+        if not self.recordings:
+            return None
+        path = os.path.join(self.recordings, f"{name}.json")
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                return json.load(f)
+        return None
+
+    def respond(self, path, query):
+        """Return (upstream, payload) for a request path, or (upstream, None) if unknown"""
+        parts = [part for part in path.split('/') if part]
+        arg = lambda name, default=None: query.get(name, [default])[0]
+
+        if parts[:2] == ['football', 'v4']:
+            if parts[2:] == ['matches']:
+                payload = self.recorded('matches') or football_matches(60)
+                if arg('status') == 'LIVE':
+                    payload = dict(payload, matches=[m for m in payload['matches'] if m['status'] in LIVE_STATUSES])
+                return 'football', payload
+            if len(parts) == 5 and parts[2] == 'competitions' and parts[4] == 'standings':
+                code = parts[3]
+                return 'football', self.recorded(f"standings_{code}") or football_standings(code=code, name=code)
+            return 'football', None
+
+        if parts[:3] == ['owm', 'data', '2.5']:
+            lat, lon = float(arg('lat', -26.2041)), float(arg('lon', 28.0473))
+            name = (arg('q') or 'Johannesburg').split(',')[0]
+            if parts[3:] == ['weather']:
+                return 'weather', self.recorded('weather') or owm_current(lat, lon, name)
+            if parts[3:] == ['forecast']:
+                return 'weather', self.recorded('forecast') or owm_forecast(int(arg('cnt', 40)), lat, lon, name)
+            return 'weather', None
+
+        if parts[:1] == ['google']:
+            return 'geocode', self.recorded('geocode') or google_reverse_geocode('street')
+
+        return 'unknown', None
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                url = urlsplit(self.path)
+                upstream, payload = stub.respond(url.path, parse_qs(url.query))
+
+                with stub.lock:
+                    delay = max(0.0, stub.random.gauss(stub.latency, stub.jitter)) / 1000
+                    roll = stub.random.random()
+                time.sleep(delay)
+
+                if payload is None:
+                    stub.count(upstream, 'not_found')
+                    self.send(404, {'message': 'Not found'})
+                elif roll < stub.throttle_rate:
+                    stub.count(upstream, 'throttled')
+                    self.send(429, {'message': 'Too many requests'}, {'Retry-After': '1'})
+                elif roll < stub.throttle_rate + stub.error_rate:
+                    stub.count(upstream, 'error')
+                    self.send(502, {'message': 'Upstream error'})
+                else:
+                    stub.count(upstream, 'ok')
+                    self.send(200, payload)
+
+            def send(self, status, payload, headers=None):
+                body = json.dumps(payload).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                try:
+                    self.wfile.write(body)
+                except (BrokenPipeError, ConnectionResetError):
+                    # The app under test was stopped mid-request
+                    pass
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def add_arguments(parser):
+    parser.add_argument('--latency', type=float, default=150, help='mean upstream latency in ms')
+    parser.add_argument('--jitter', type=float, default=50, help='latency standard deviation in ms')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='fraction of 502 responses')
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help='fraction of 429 responses')
+    parser.add_argument('--recordings', help='directory of recorded JSON responses')
+    parser.add_argument('--seed', type=int, default=1)
+
+
+def from_arguments(args, host='127.0.0.1', port=0):
+    return UpstreamStub(host, port, args.latency, args.jitter, args.error_rate, args.throttle_rate,
+                        args.recordings, args.seed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8901)
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    stub = from_arguments(args, args.host, args.port)
+    for name, value in stub.env().items():
+        print(f"export {name}={value}")
+    try:
+        stub.server.serve_forever()
+    except KeyboardInterrupt:
+        print(json.dumps(stub.stats, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,15 @@
+# gunicorn.conf.py - picked up automatically by gunicorn from the working directory
+import os
+import sys
+
+# Connections per gevent worker. app.py reads the same WORKER_CONNECTIONS and
+# caps live score streams at 80% of it, so long-lived SSE clients can never
+# take every socket; change it here (or via the env var), not in the Procfile
+worker_connections = int(os.getenv('WORKER_CONNECTIONS', 1000))
+
+
+def worker_exit(server, worker):
+    """Write the cache snapshot when a worker stops, e.g. on SIGTERM during a deploy"""
+    portal = sys.modules.get('app')
+    if portal is not None and os.getenv('CACHE_SNAPSHOT', '1') == '1':
+        portal.cache_snapshot.save_quietly()
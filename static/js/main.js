@@ -279,8 +279,45 @@ class MainApp {
     
     initSportsTicker() {
         this.updateSportsTicker();
+        
+        // Prefer pushed live scores, fall back to polling
+        if (window.EventSource) {
+            this.initLiveScoreStream();
+        } else {
+            this.startSportsTickerPolling();
+        }
+    }
+    
+    startSportsTickerPolling() {
+        if (this.sportsTickerTimer) return;
         // Update every 2 minutes
-        setInterval(() => this.updateSportsTicker(), 120000);
+        this.sportsTickerTimer = setInterval(() => this.updateSportsTicker(), 120000);
+    }
+    
+    initLiveScoreStream() {
+        const stream = new EventSource('/api/sports/stream');
+        let failures = 0;
+        
+        stream.addEventListener('scores', (event) => {
+            failures = 0;
+            const data = JSON.parse(event.data);
+            
+            if (data.matches && data.matches.length > 0) {
+                this.displaySportsTicker(data.matches);
+            } else if (data.finished && data.finished.length > 0) {
+                // Last live match ended, show today's results and fixtures
+                this.updateSportsTicker();
+            }
+        });
+        
+        stream.onerror = () => {
+            failures++;
+            // EventSource retries on its own; give up if the server refuses us
+            if (stream.readyState === EventSource.CLOSED || failures >= 3) {
+                stream.close();
+                this.startSportsTickerPolling();
+            }
+        };
     }
     
     async updateSportsTicker() {